@@ -0,0 +1,153 @@
+"""
+Benchmark the read endpoints on SQLite with the tuned profile (db.py,
+SQLITE_TUNING=1: WAL, pragmas, read-only pool) against driver defaults
+(SQLITE_TUNING=0), while a writer commits cron-style comments in the background.
+
+    python backend/bench_sqlite.py [--posts 5000] [--seconds 10] [--readers 8]
+
+Each profile runs in its own process against a fresh copy of the same
+database, with the response cache disabled so every request hits SQLite.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+READ_URLS = [
+    "/api/posts?sort=new",
+    "/api/posts?sort=hot&tag=transfer",
+    "/api/posts?sort=top&page=3",
+    "/api/tags",
+    "/api/stats",
+    "/api/regulars",
+    "/api/search?q=transfer",
+]
+
+
+def _build(path: str, posts: int):
+    """Seeded database plus `posts` synthetic posts with 3 comments each (via importer.py)."""
+    env = {**os.environ, "SQLITE_PATH": path, "SQLITE_TUNING": "0"}
+    env.pop("DATABASE_URL", None)
+    env.pop("POSTGRES_URL", None)
+    script = f"""
+import json, sys
+sys.path.insert(0, {HERE!r})
+from fastapi.testclient import TestClient
+from main import app
+from db import session_local
+from importer import import_lines
+with TestClient(app):
+    pass
+lines = []
+for i in range({posts}):
+    lines.append(json.dumps({{"type": "post", "slug": f"bench-{{i}}", "title": f"bench transfer story {{i}}",
+        "content": "lorem ipsum transfer rumour " * 20, "author_name": f"author{{i % 200}}",
+        "created_at": f"2025-{{1 + i % 12:02d}}-{{1 + i % 28:02d}}T{{i % 24:02d}}:00:00", "tags": ["transfer"]}}))
+    for j in range(3):
+        lines.append(json.dumps({{"type": "comment", "post_slug": f"bench-{{i}}", "author_name": f"user{{j}}",
+            "content": "great story " * 10, "created_at": f"2025-12-01T{{j:02d}}:{{i % 60:02d}}:{{(i // 60) % 60:02d}}"}}))
+db = session_local()
+import_lines(db, lines)
+db.close()
+"""
+    subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True)
+
+
+def _run(seconds: float, readers: int) -> dict:
+    """Inside a profile's process: hammer READ_URLS from `readers` threads while one thread writes."""
+    sys.path.insert(0, HERE)
+    from fastapi.testclient import TestClient
+    from main import app
+    from db import session_local
+    from models import Comment, Post
+    import counters
+
+    latencies, errors, writes = [], [0], [0]
+    stop = time.perf_counter() + seconds
+
+    def writer():
+        db = session_local()
+        post = db.query(Post).order_by(Post.id.desc()).first()
+        while time.perf_counter() < stop:
+            comment = Comment(post_id=post.id, author_name="bench", content="write load")
+            db.add(comment)
+            counters.record_comment(db, post, comment)
+            db.commit()
+            writes[0] += 1
+            time.sleep(0.005)
+        db.close()
+
+    def reader(client, offset):
+        i = offset
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            if client.get(READ_URLS[i % len(READ_URLS)]).status_code != 200:
+                errors[0] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+            i += 1
+
+    # lock timeouts etc. count as errors instead of killing the reader thread
+    with TestClient(app, raise_server_exceptions=False) as client:
+        threads = [threading.Thread(target=writer)] + [
+            threading.Thread(target=reader, args=(client, n)) for n in range(readers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "req_per_sec": round(len(latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)], 1),
+        "errors": errors[0],
+        "writer_commits": writes[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(_run(args.seconds, args.readers)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, "base.db")
+        print(f"building database with {args.posts} posts ...")
+        _build(base, args.posts)
+        results = {}
+        for name, tuning in (("defaults", "0"), ("tuned", "1")):
+            path = os.path.join(tmp, f"{name}.db")
+            shutil.copy(base, path)
+            env = {**os.environ, "SQLITE_PATH": path, "SQLITE_TUNING": tuning, "RESPONSE_CACHE_SIZE": "0"}
+            env.pop("DATABASE_URL", None)
+            env.pop("POSTGRES_URL", None)
+            out = subprocess.run(
+                [sys.executable, __file__, "--run", f"--seconds={args.seconds}", f"--readers={args.readers}"],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results[name] = json.loads(out.strip().splitlines()[-1])
+
+    keys = list(results["defaults"])
+    print(f"{'':>16}" + "".join(f"{k:>16}" for k in results))
+    for key in keys:
+        print(f"{key:>16}" + "".join(f"{r[key]:>16}" for r in results.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Build backend/snapshot.db at deploy time: a fully migrated and seeded SQLite
+database that db.py copies into place on a cold start when no DATABASE_URL
+is set, so the first request doesn't wait for the seed.
+Run from the repo root (vercel.json buildCommand): python backend/build_snapshot.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot.db")
+
+# always SQLite, even when the build environment has a Postgres URL
+os.environ.pop("DATABASE_URL", None)
+os.environ.pop("POSTGRES_URL", None)
+os.environ["SQLITE_PATH"] = f"{SNAPSHOT}.build"
+# build from scratch: restoring the previous snapshot would make seed.run skip as "already seeded"
+os.environ["SQLITE_SNAPSHOT"] = "0"
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    if os.path.exists(os.environ["SQLITE_PATH"]):
+        os.remove(os.environ["SQLITE_PATH"])
+
+    from db import engine, session_local
+    from models import Base
+    import migrations
+    import seed
+
+    Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
+    db = session_local()
+    try:
+        seed.run(db)
+    finally:
+        db.close()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+    engine.dispose()
+
+    os.replace(os.environ["SQLITE_PATH"], SNAPSHOT)
+    print(f"snapshot written to {SNAPSHOT} in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,140 @@
+"""
+In-process response cache and HTTP conditional GET for the read endpoints.
+Content only changes when the cron or the seed commits, and both bump the
+data_version row in app_meta inside that same transaction. Cached bodies are
+tagged with the version they were built under, so a bump from any instance
+invalidates every instance's cache the next time it re-reads the version
+(at most once every DATA_VERSION_TTL seconds, and on every request that
+sends X-Read-Primary: 1, see db.read_primary).
+
+The same version drives the ETag, and the bump time (data_modified_at) drives
+Last-Modified, so If-None-Match / If-Modified-Since are answered with a 304
+before any endpoint query runs.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from db import read_primary
+from models import AppMeta
+
+MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_SIZE", "512"))
+VERSION_TTL = float(os.environ.get("DATA_VERSION_TTL", "5"))
+# part of every ETag, so a deploy that changes response shapes invalidates browser copies
+BUILD_ID = (os.environ.get("VERCEL_GIT_COMMIT_SHA") or "dev")[:12]
+
+_lock = threading.Lock()
+_entries: OrderedDict[tuple, tuple[int, object]] = OrderedDict()
+_version: int | None = None
+_modified_at = 0
+_version_checked_at = 0.0
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "not_modified": 0}
+
+
+def _data_state(db: Session, fresh: bool = False) -> tuple[int, int]:
+    """(data_version, data_modified_at), re-read at most every VERSION_TTL seconds unless `fresh`."""
+    global _version, _modified_at, _version_checked_at
+    now = time.monotonic()
+    if fresh or _version is None or now - _version_checked_at >= VERSION_TTL:
+        rows = dict(
+            db.query(AppMeta.key, AppMeta.value)
+            .filter(AppMeta.key.in_(["data_version", "data_modified_at"]))
+            .all()
+        )
+        _version = rows.get("data_version", 0)
+        _modified_at = rows.get("data_modified_at", 0)
+        _version_checked_at = now
+    return _version, _modified_at
+
+
+def data_version(db: Session) -> int:
+    return _data_state(db)[0]
+
+
+def set_meta(db: Session, key: str, value):
+    """Upsert an app_meta row; `value` may be a SQL expression on AppMeta.value."""
+    updated = db.execute(
+        update(AppMeta).where(AppMeta.key == key).values(value=value),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    if not updated:
+        db.add(AppMeta(key=key, value=value if isinstance(value, int) else 1))
+
+
+def bump_data_version(db: Session):
+    """Invalidate cached responses everywhere. Call right before the write path commits."""
+    global _version
+    set_meta(db, "data_version", AppMeta.value + 1)
+    set_meta(db, "data_modified_at", int(time.time()))
+    with _lock:
+        _entries.clear()
+        _version = None
+
+
+def _not_modified(request: Request, etag: str, modified_at: int) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and modified_at:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return modified_at <= since.timestamp()
+    return False
+
+
+def cached(request: Request, response: Response, db: Session, build, max_age: int, swr: int, **params):
+    """
+    Serve a read endpoint: 304 if the client's copy is current, else the cached
+    body for this route, else build(), encode and store it.
+    `params` are the endpoint's validated query params: keying on those rather
+    than the raw query string means defaults, ordering and unknown params
+    don't fragment the cache. max_age / swr tune Cache-Control per endpoint.
+    """
+    # read-your-writes requests can't trust a version another instance may have bumped since
+    version, modified_at = _data_state(db, fresh=read_primary.get())
+    headers = {
+        "ETag": f'"{version}-{BUILD_ID}"',
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={swr}",
+    }
+    if modified_at:
+        headers["Last-Modified"] = format_datetime(datetime.fromtimestamp(modified_at, timezone.utc), usegmt=True)
+    if _not_modified(request, headers["ETag"], modified_at):
+        with _lock:
+            _stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    key = (request.url.path, tuple(sorted(params.items())))
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry[0] == version:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[1]
+        _stats["misses"] += 1
+
+    body = jsonable_encoder(build())
+    with _lock:
+        _entries[key] = (version, body)
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+    return body
+
+
+def stats() -> dict:
+    with _lock:
+        return {**_stats, "entries": len(_entries), "max_entries": MAX_ENTRIES, "data_version": _version}
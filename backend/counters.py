@@ -0,0 +1,275 @@
+"""
+Denormalized counters on Post (score, comment_count, hot_score), the
+per-tag ranking rows in post_ranks that mirror them, the site_stats
+snapshot row behind /api/stats and the per-author user_stats rows behind
+the regulars endpoints.
+Every write path that inserts a tag, post, vote or comment goes through
+record_tag / record_post / record_vote / record_comment, in the same
+transaction, so reads never need to aggregate or count the big tables. hot_score decays with age, so it is recomputed in
+bulk by refresh_hot_scores (cron run, seed, /api/cron/refresh-hot) rather
+than per request. Run this file directly to recompute everything from
+scratch after drift.
+"""
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from models import Post, PostRank, Comment, Vote, Tag, SiteStats, UserStats, post_tags
+from routers.regulars import REGULARS_FINGERPRINTS
+
+# votes only carry a fingerprint; the regulars' are the only ones tied to a name
+_NAME_BY_FINGERPRINT = {fp: name for name, fp in REGULARS_FINGERPRINTS.items()}
+
+HOT_WINDOW = timedelta(days=14)  # older posts drop to hot_score 0
+HOT_VELOCITY_WINDOW = timedelta(hours=24)
+HOT_GRAVITY = 1.5
+
+
+def _site_stats(db: Session) -> SiteStats:
+    # identity-mapped once loaded, so one SELECT per write transaction; a row
+    # created earlier in this (unflushed) transaction is only in db.new
+    stats = db.get(SiteStats, 1) or next((obj for obj in db.new if isinstance(obj, SiteStats)), None)
+    if stats is None:
+        stats = SiteStats(id=1, total_posts=0, total_comments=0, total_votes=0, total_tags=0)
+        db.add(stats)
+    return stats
+
+
+def _naive(dt: datetime | None) -> datetime | None:
+    return dt.replace(tzinfo=None) if dt else dt
+
+
+def _user_stats(db: Session, name: str, active_at: datetime | None) -> UserStats:
+    # db.get doesn't see rows added earlier in this (unflushed) transaction
+    stats = db.get(UserStats, name) or next(
+        (obj for obj in db.new if isinstance(obj, UserStats) and obj.name == name), None
+    )
+    if stats is None:
+        stats = UserStats(name=name, post_count=0, comment_count=0, votes_cast=0)
+        db.add(stats)
+    if active_at and (stats.last_active_at is None or _naive(active_at) > _naive(stats.last_active_at)):
+        stats.last_active_at = _naive(active_at)
+    return stats
+
+
+def record_tag(db: Session):
+    """Count a tag that has just been added."""
+    _site_stats(db).total_tags += 1
+
+
+def record_post(db: Session, post: Post):
+    """Create the ranking rows for a new post. Call after its tags are set, before the flush."""
+    stats = _site_stats(db)
+    stats.total_posts += 1
+    if post.created_at and (stats.last_post_at is None or _naive(post.created_at) > _naive(stats.last_post_at)):
+        stats.last_post_at = _naive(post.created_at)
+    _user_stats(db, post.author_name, post.created_at).post_count += 1
+    post.ranks = [
+        PostRank(
+            tag_id=tag.id,
+            created_at=post.created_at,
+            score=post.score or 0,
+            comment_count=post.comment_count or 0,
+            hot_score=post.hot_score or 0,
+        )
+        for tag in post.tags
+    ]
+
+
+def record_vote(db: Session, post: Post, vote: Vote):
+    """Apply a vote that has just been added for `post`."""
+    post.score = (post.score or 0) + vote.value
+    _site_stats(db).total_votes += 1
+    name = _NAME_BY_FINGERPRINT.get(vote.fingerprint)
+    if name:
+        _user_stats(db, name, post.created_at).votes_cast += 1
+    for rank in post.ranks:
+        rank.score = post.score
+
+
+def record_comment(db: Session, post: Post, comment: Comment):
+    """Apply a comment that has just been added for `post`."""
+    post.comment_count = (post.comment_count or 0) + 1
+    _site_stats(db).total_comments += 1
+    _user_stats(db, comment.author_name, comment.created_at).comment_count += 1
+    for rank in post.ranks:
+        rank.comment_count = post.comment_count
+
+
+def record_bulk(db: Session, tags: int, posts: list[dict], comments: list[dict], votes: list[dict]):
+    """
+    Apply rows inserted in bulk (importer.py, as column dicts) to site_stats
+    and to the user_stats rows of the names behind them, as deltas. Post
+    counters and rankings are refreshed separately, for the posts they touch.
+    """
+    stats = _site_stats(db)
+    stats.total_tags += tags
+    stats.total_posts += len(posts)
+    stats.total_comments += len(comments)
+    stats.total_votes += len(votes)
+    last_post_at = max((_naive(p["created_at"]) for p in posts), default=None)
+    if last_post_at and (stats.last_post_at is None or last_post_at > _naive(stats.last_post_at)):
+        stats.last_post_at = last_post_at
+
+    # name -> [posts, comments, votes cast, last active]; a vote's activity time is its post's
+    deltas: dict[str, list] = {}
+
+    def add(name: str, column: int, active_at):
+        delta = deltas.setdefault(name, [0, 0, 0, None])
+        delta[column] += 1
+        if active_at and (delta[3] is None or _naive(active_at) > delta[3]):
+            delta[3] = _naive(active_at)
+
+    for p in posts:
+        add(p["author_name"], 0, p["created_at"])
+    for c in comments:
+        add(c["author_name"], 1, c["created_at"])
+    regular_votes = [v for v in votes if v["fingerprint"] in _NAME_BY_FINGERPRINT]
+    if regular_votes:
+        created = dict(db.query(Post.id, Post.created_at).filter(Post.id.in_({v["post_id"] for v in regular_votes})))
+        for v in regular_votes:
+            add(_NAME_BY_FINGERPRINT[v["fingerprint"]], 2, created.get(v["post_id"]))
+    if not deltas:
+        return
+
+    rows = {row.name: row for row in db.query(UserStats).filter(UserStats.name.in_(list(deltas)))}
+    for name, (post_count, comment_count, votes_cast, active_at) in deltas.items():
+        row = rows.get(name)
+        if row is None:
+            row = UserStats(name=name, post_count=0, comment_count=0, votes_cast=0)
+            db.add(row)
+        row.post_count += post_count
+        row.comment_count += comment_count
+        row.votes_cast += votes_cast
+        if active_at and (row.last_active_at is None or active_at > _naive(row.last_active_at)):
+            row.last_active_at = active_at
+
+
+def recalc_post_counters(db: Session, post_ids=None):
+    """Recompute score and comment_count for every post (or just `post_ids`) in two UPDATE statements."""
+    vote_sum = (
+        select(func.coalesce(func.sum(Vote.value), 0))
+        .where(Vote.post_id == Post.id)
+        .scalar_subquery()
+    )
+    comment_total = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id)
+        .scalar_subquery()
+    )
+    scores = update(Post).values(score=vote_sum)
+    comment_counts = update(Post).values(comment_count=comment_total)
+    if post_ids is not None:
+        scores = scores.where(Post.id.in_(post_ids))
+        comment_counts = comment_counts.where(Post.id.in_(post_ids))
+    db.execute(scores, execution_options={"synchronize_session": False})
+    db.execute(comment_counts, execution_options={"synchronize_session": False})
+
+
+def rebuild_post_ranks(db: Session, post_ids=None):
+    """Refill post_ranks (all of it, or just `post_ids`' rows) from posts + post_tags (run after recalc_post_counters)."""
+    old = delete(PostRank)
+    new = (
+        select(post_tags.c.tag_id, Post.id, Post.created_at, Post.score, Post.comment_count, Post.hot_score)
+        .join(post_tags, post_tags.c.post_id == Post.id)
+    )
+    if post_ids is not None:
+        old = old.where(PostRank.post_id.in_(post_ids))
+        new = new.where(Post.id.in_(post_ids))
+    db.execute(old, execution_options={"synchronize_session": False})
+    db.execute(insert(PostRank).from_select(
+        ["tag_id", "post_id", "created_at", "score", "comment_count", "hot_score"], new,
+    ))
+
+
+def rebuild_site_stats(db: Session):
+    """Recount the site_stats snapshot row from the base tables in one SELECT."""
+    totals = db.execute(select(
+        select(func.count(Post.id)).scalar_subquery(),
+        select(func.count(Comment.id)).scalar_subquery(),
+        select(func.count(Vote.id)).scalar_subquery(),
+        select(func.count(Tag.id)).scalar_subquery(),
+        select(func.max(Post.created_at)).scalar_subquery(),
+    )).one()
+    stats = _site_stats(db)
+    stats.total_posts, stats.total_comments, stats.total_votes, stats.total_tags, stats.last_post_at = totals
+
+
+def rebuild_user_stats(db: Session):
+    """Refill user_stats from posts, comments and votes."""
+    rows: dict[str, dict] = {}
+
+    def row(name: str, active_at) -> dict:
+        r = rows.setdefault(name, {"name": name, "post_count": 0, "comment_count": 0, "votes_cast": 0, "last_active_at": None})
+        if active_at and (r["last_active_at"] is None or active_at > r["last_active_at"]):
+            r["last_active_at"] = active_at
+        return r
+
+    for name, count, last in db.query(Post.author_name, func.count(Post.id), func.max(Post.created_at)).group_by(Post.author_name):
+        row(name, last)["post_count"] = count
+    for name, count, last in db.query(Comment.author_name, func.count(Comment.id), func.max(Comment.created_at)).group_by(Comment.author_name):
+        row(name, last)["comment_count"] = count
+    for fp, count, last in (
+        db.query(Vote.fingerprint, func.count(Vote.id), func.max(Post.created_at))
+        .join(Post, Vote.post_id == Post.id)
+        .filter(Vote.fingerprint.in_(_NAME_BY_FINGERPRINT))
+        .group_by(Vote.fingerprint)
+    ):
+        row(_NAME_BY_FINGERPRINT[fp], last)["votes_cast"] = count
+
+    db.execute(delete(UserStats), execution_options={"synchronize_session": False})
+    if rows:
+        db.execute(insert(UserStats), list(rows.values()))
+
+
+def hot_score(score: int, recent_comments: int, age: timedelta) -> float:
+    """Net votes plus comment velocity, divided down by age (HN-style gravity)."""
+    hours = max(age.total_seconds(), 0) / 3600
+    return max(score + 2 * recent_comments + 1, 0) / (hours + 2) ** HOT_GRAVITY
+
+
+def refresh_hot_scores(db: Session, now: datetime | None = None, post_ids=None) -> int:
+    """Recompute hot_score for posts (or just `post_ids`) inside HOT_WINDOW and zero the rest. Returns posts scored."""
+    db.flush()
+    now = now or datetime.now(timezone.utc)
+    # created_at comes back naive (UTC) from SQLite and timestamp-without-tz columns
+    naive_now = now.replace(tzinfo=None)
+    cutoff = naive_now - HOT_WINDOW
+    recent = db.query(Comment.post_id, func.count(Comment.id)).filter(Comment.created_at >= naive_now - HOT_VELOCITY_WINDOW)
+    scored = db.query(Post.id, Post.score, Post.created_at).filter(Post.created_at >= cutoff)
+    expired = update(Post).where(Post.created_at < cutoff, Post.hot_score != 0).values(hot_score=0)
+    ranks = update(PostRank).values(
+        hot_score=select(Post.hot_score).where(Post.id == PostRank.post_id).scalar_subquery()
+    )
+    if post_ids is not None:
+        recent = recent.filter(Comment.post_id.in_(post_ids))
+        scored = scored.filter(Post.id.in_(post_ids))
+        expired = expired.where(Post.id.in_(post_ids))
+        ranks = ranks.where(PostRank.post_id.in_(post_ids))
+    velocity = dict(recent.group_by(Comment.post_id).all())
+    rows = [
+        {"id": post_id, "hot_score": hot_score(score, velocity.get(post_id, 0), naive_now - created_at.replace(tzinfo=None))}
+        for post_id, score, created_at in scored
+    ]
+    if rows:
+        db.execute(update(Post), rows)
+    db.execute(expired, execution_options={"synchronize_session": False})
+    db.execute(ranks, execution_options={"synchronize_session": False})
+    return len(rows)
+
+
+if __name__ == "__main__":
+    from db import session_local
+
+    db = session_local()
+    try:
+        recalc_post_counters(db)
+        refresh_hot_scores(db)
+        rebuild_post_ranks(db)
+        rebuild_site_stats(db)
+        rebuild_user_stats(db)
+        db.commit()
+    finally:
+        db.close()
+    print("post counters, rankings, site and user stats recalculated")
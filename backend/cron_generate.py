@@ -18,6 +18,9 @@ from groq import Groq
 from sqlalchemy.orm import Session
 
 from models import Post, Tag, Comment, Vote
+import counters
+import cache
+import search
 
 TAGS = ["Transfer", "Stats", "Coaching", "True Story", "Absurd", "Breaking"]
 
@@ -442,18 +445,21 @@ def cast_votes_for_post(post: Post, db: Session) -> int:
 
         # Use a savepoint so a duplicate constraint doesn't kill the outer transaction
         savepoint = db.begin_nested()
+        vote = Vote(
+            post_id=post.id,
+            fingerprint=regular["fingerprint"],
+            value=value,
+        )
         try:
-            db.add(Vote(
-                post_id=post.id,
-                fingerprint=regular["fingerprint"],
-                value=value,
-            ))
+            db.add(vote)
             savepoint.commit()
-            cast += 1
-            if value == 1:
-                upvotes += 1
         except Exception:
             savepoint.rollback()
+            continue
+        counters.record_vote(db, post, vote)
+        cast += 1
+        if value == 1:
+            upvotes += 1
 
     # Update truth_score: start from base (50 for true, 0 for fake), add net * 15, clamp 0-100
     if cast > 0:
@@ -512,6 +518,7 @@ def run_cron_generate(db: Session) -> dict:
         )
         for name in tag_names:
             post.tags.append(tags_by_name[name])
+        counters.record_post(db, post)
         db.add(post)
         db.flush()  # get post.id
 
@@ -521,19 +528,25 @@ def run_cron_generate(db: Session) -> dict:
         for idx, c in enumerate(comments_data):
             if c["author_name"] not in REGULAR_NAMES:
                 continue
-            db.add(Comment(
+            comment = Comment(
                 post_id=post.id,
                 author_name=c["author_name"],
                 content=c["content"],
                 created_at=now + timedelta(minutes=idx + 1),
-            ))
+            )
+            db.add(comment)
+            counters.record_comment(db, post, comment)
             comments_created += 1
 
+        search.index_post(db, post.id)
+
         # Regulars cast votes (uses savepoints internally)
         votes_cast += cast_votes_for_post(post, db)
         created += 1
 
     if created:
+        counters.refresh_hot_scores(db)
+        cache.bump_data_version(db)
         db.commit()
 
     return {
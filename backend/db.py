@@ -1,24 +1,268 @@
-from sqlalchemy import create_engine
+from contextvars import ContextVar
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 import os
+import sqlite3
+import threading
+import time
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "snapshot.db")
+# SQLITE_SNAPSHOT=0 starts a missing database empty (build_snapshot.py must not build on the old snapshot)
+RESTORE_SNAPSHOT = os.environ.get("SQLITE_SNAPSHOT", "1") == "1"
+
+
+def _restore_snapshot(db_path: str):
+    """Copy the prebuilt SQLite snapshot to db_path with the backup API (page copy, no SQL replay)."""
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    src = sqlite3.connect(f"file:{SNAPSHOT_PATH}?mode=ro&immutable=1", uri=True)
+    dst = sqlite3.connect(tmp_path)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    os.replace(tmp_path, db_path)  # atomic, so a concurrent start never opens a half-written file
+
+
+# Postgres pool strategy (DB_POOL_MODE):
+#   single - one pooled connection per process (default; one Vercel instance serves one request at a time)
+#   queue  - sized QueuePool, for long-lived uvicorn workers serving concurrent requests
+#   null   - no pooling, for use behind PgBouncer / Neon's -pooler endpoint
+# Stale connections are handled optimistically: recycled after DB_POOL_RECYCLE seconds, and a
+# disconnect error invalidates the pool so the next checkout reconnects. DB_POOL_PRE_PING=1
+# restores the per-checkout ping (one extra round trip per request).
+POOL_MODE = os.environ.get("DB_POOL_MODE", "single")
+_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "240"))  # under Neon's 5 min idle suspend
+_PRE_PING = os.environ.get("DB_POOL_PRE_PING") == "1"
+
+_pool_lock = threading.Lock()
+_pool_stats = {
+    "checkouts": 0, "connects": 0, "invalidations": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0,
+    "replica_reads": 0, "replica_failures": 0,
+}
+
+
+class _TimedPool:
+    """Records how long each checkout waited for a connection (queue wait + connect)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = (time.perf_counter() - started) * 1000
+            with _pool_lock:
+                _pool_stats["wait_ms_total"] += waited
+                _pool_stats["wait_ms_max"] = max(_pool_stats["wait_ms_max"], waited)
+
+
+class _TimedQueuePool(_TimedPool, QueuePool):
+    pass
+
+
+class _TimedAsyncQueuePool(_TimedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+class _TimedNullPool(_TimedPool, NullPool):
+    pass
+
+
+def _pool_args(is_async: bool = False) -> dict:
+    queue_pool = _TimedAsyncQueuePool if is_async else _TimedQueuePool
+    if POOL_MODE == "null":
+        return {"poolclass": _TimedNullPool}
+    if POOL_MODE == "queue":
+        return {
+            "poolclass": queue_pool,
+            "pool_size": int(os.environ.get("DB_POOL_SIZE", "5")),
+            "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "5")),
+            "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            "pool_recycle": _POOL_RECYCLE,
+            "pool_pre_ping": _PRE_PING,
+        }
+    if POOL_MODE == "single":
+        return {
+            "poolclass": queue_pool,
+            "pool_size": 1,
+            "max_overflow": 0,
+            "pool_recycle": _POOL_RECYCLE,
+            "pool_pre_ping": _PRE_PING,
+        }
+    raise ValueError(f"DB_POOL_MODE must be single, queue or null, not {POOL_MODE!r}")
+
+
+def _count(key: str):
+    def listener(*args):
+        with _pool_lock:
+            _pool_stats[key] += 1
+    return listener
+
+
+def pool_stats() -> dict:
+    """Checkout / connect counters and checkout wait times, for /api/stats/pool."""
+    with _pool_lock:
+        stats = dict(_pool_stats)
+    stats["wait_ms_avg"] = stats["wait_ms_total"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    for key in ("wait_ms_total", "wait_ms_max", "wait_ms_avg"):
+        stats[key] = round(stats[key], 2)
+    pools = {"status": engine.pool.status()}
+    if read_engine is not engine:
+        pools["read_status"] = read_engine.pool.status()
+    if replica_engine is not None:
+        pools["replica_status"] = replica_engine.pool.status()
+        pools["replica_healthy"] = time.monotonic() >= _replica_down_until
+    return {"mode": POOL_MODE if is_postgres else "sqlite", **pools, **stats}
+
+
+# SQLite tuning (SQLITE_TUNING=0 keeps the driver defaults, e.g. for bench_sqlite.py): WAL so
+# readers don't block behind the cron writer, NORMAL sync (durable at checkpoints, safe in WAL),
+# memory-mapped reads, a 32 MB page cache and in-memory temp tables for sorts.
+SQLITE_TUNING = os.environ.get("SQLITE_TUNING", "1") == "1"
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-32000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+# journal_mode is persistent and set by the writer; read connections only add query_only
+_SQLITE_READ_PRAGMAS = _SQLITE_PRAGMAS[1:] + ("PRAGMA query_only=1",)
+
+
+def _sqlite_pragmas(pragmas: tuple[str, ...]):
+    def on_connect(dbapi_conn, record):
+        cursor = dbapi_conn.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+    return on_connect
+
+
+def _postgres_url(url: str) -> str:
+    # Neon connection strings use postgresql:// - ensure sslmode for serverless
+    if "sslmode=" not in url and "?" not in url:
+        return f"{url}?sslmode=require"
+    if "sslmode=" not in url and "?" in url:
+        return f"{url}&sslmode=require"
+    return url
+
+
+def _asyncpg_url(url: str):
+    # asyncpg takes ssl=, not libpq's sslmode= / channel_binding=
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    query = dict(async_url.query)
+    query.pop("channel_binding", None)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return async_url.set(query=query)
+
 
 # Use Neon Postgres when DATABASE_URL or POSTGRES_URL is set (e.g. via Vercel + Neon integration)
 _db_url = os.environ.get("DATABASE_URL") or os.environ.get("POSTGRES_URL")
+# backend-specific features (e.g. full-text search in search.py) branch on this
+is_postgres = bool(_db_url)
+# optional Postgres read replica for the GET endpoints (see run_read)
+_replica_url = os.environ.get("DATABASE_READ_URL") if is_postgres else None
+replica_engine = None
 if _db_url:
-    # Neon connection strings use postgresql:// - ensure sslmode for serverless
-    if "sslmode=" not in _db_url and "?" not in _db_url:
-        _db_url = f"{_db_url}?sslmode=require"
-    elif "sslmode=" not in _db_url and "?" in _db_url:
-        _db_url = f"{_db_url}&sslmode=require"
-    engine = create_engine(_db_url, echo=False, pool_pre_ping=True, pool_size=1, max_overflow=0)
+    _db_url = _postgres_url(_db_url)
+    engine = create_engine(_db_url, echo=False, **_pool_args())
+    read_engine = engine
+    if _replica_url:
+        _replica_url = _postgres_url(_replica_url)
+        replica_engine = create_engine(_replica_url, echo=False, **_pool_args())
 else:
     # Local dev: SQLite
-    if os.environ.get("VERCEL"):
+    if os.environ.get("SQLITE_PATH"):
+        db_path = os.environ["SQLITE_PATH"]
+    elif os.environ.get("VERCEL"):
         db_path = "/tmp/fakefootball.db"
     else:
         db_path = os.path.join(os.path.dirname(__file__), "fakefootball.db")
-    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    # start from the build-time snapshot (build_snapshot.py) instead of seeding from scratch
+    if RESTORE_SNAPSHOT and not os.path.exists(db_path) and os.path.exists(SNAPSHOT_PATH):
+        _restore_snapshot(db_path)
+    engine = create_engine(f"sqlite:///{db_path}", echo=False, poolclass=_TimedQueuePool)
+    if SQLITE_TUNING:
+        event.listen(engine, "connect", _sqlite_pragmas(_SQLITE_PRAGMAS))
+        # separate read-only pool: GET handlers can never take the write lock
+        read_engine = create_engine(f"sqlite:///file:{db_path}?mode=ro&uri=true", echo=False, poolclass=_TimedQueuePool)
+        event.listen(read_engine, "connect", _sqlite_pragmas(_SQLITE_READ_PRAGMAS))
+    else:
+        read_engine = engine
+
+# DB_ASYNC=1: read endpoints run on an asyncio engine (asyncpg / aiosqlite), so one worker's
+# event loop overlaps many in-flight queries instead of parking a threadpool thread per request.
+# Writes (cron, seed, import) always use the sync engine above.
+ASYNC_READS = os.environ.get("DB_ASYNC") == "1"
+async_read_engine = None
+async_replica_engine = None
+if ASYNC_READS:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    if is_postgres:
+        async_read_engine = create_async_engine(_asyncpg_url(_db_url), echo=False, **_pool_args(is_async=True))
+        if _replica_url:
+            async_replica_engine = create_async_engine(
+                _asyncpg_url(_replica_url), echo=False, **_pool_args(is_async=True)
+            )
+    else:
+        async_read_engine = create_async_engine(
+            f"sqlite+aiosqlite:///file:{db_path}?mode=ro&uri=true" if SQLITE_TUNING else f"sqlite+aiosqlite:///{db_path}",
+            echo=False, poolclass=_TimedAsyncQueuePool,
+        )
+        if SQLITE_TUNING:
+            event.listen(async_read_engine.sync_engine, "connect", _sqlite_pragmas(_SQLITE_READ_PRAGMAS))
+
+_engines = {engine, read_engine}
+for _async_engine in (async_read_engine, async_replica_engine):
+    if _async_engine is not None:
+        _engines.add(_async_engine.sync_engine)
+if replica_engine is not None:
+    _engines.add(replica_engine)
+for _engine in _engines:
+    event.listen(_engine, "checkout", _count("checkouts"))
+    event.listen(_engine, "connect", _count("connects"))
+    event.listen(_engine, "invalidate", _count("invalidations"))
 session_local = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+read_session_local = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
+replica_session_local = sessionmaker(bind=replica_engine, autoflush=False, autocommit=False) if replica_engine else None
+async_read_session_local = async_sessionmaker(bind=async_read_engine, autoflush=False) if async_read_engine else None
+async_replica_session_local = (
+    async_sessionmaker(bind=async_replica_engine, autoflush=False) if async_replica_engine else None
+)
+
+# Replica routing: reads go to the replica unless
+#   - the request sent X-Read-Primary: 1 (read_primary, set by main.py's middleware),
+#   - this process committed a write in the last DATABASE_READ_LAG seconds (read-your-writes), or
+#   - the replica failed within the last DATABASE_READ_RETRY seconds (reads fall back to the primary).
+READ_LAG = float(os.environ.get("DATABASE_READ_LAG", "5"))
+REPLICA_RETRY = float(os.environ.get("DATABASE_READ_RETRY", "30"))
+read_primary: ContextVar[bool] = ContextVar("read_primary", default=False)
+_last_write_at = float("-inf")
+_replica_down_until = float("-inf")
+# errors that mean the replica is unreachable or unusable, not that the query is wrong
+_REPLICA_ERRORS = (OperationalError, InterfaceError, OSError)
+
+
+@event.listens_for(engine, "commit")
+def _note_write(conn):
+    global _last_write_at
+    _last_write_at = time.monotonic()
+
+
+def _use_replica() -> bool:
+    if replica_engine is None or read_primary.get():
+        return False
+    now = time.monotonic()
+    return now - _last_write_at >= READ_LAG and now >= _replica_down_until
 
 
 def get_db():
@@ -27,3 +271,41 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _run_with_session(factory, fn):
+    db = factory()
+    try:
+        return fn(db)
+    finally:
+        db.close()
+
+
+async def _run_read(fn, replica: bool):
+    if ASYNC_READS:
+        async with (async_replica_session_local if replica else async_read_session_local)() as db:
+            return await db.run_sync(fn)
+    return await run_in_threadpool(_run_with_session, replica_session_local if replica else read_session_local, fn)
+
+
+async def run_read(fn):
+    """
+    Run fn(session) for a read endpoint and return its result. fn is plain
+    sync ORM code either way: with DB_ASYNC=1 it runs through
+    AsyncSession.run_sync on the async engine, otherwise on a threadpool
+    thread with a sync session. The session is on the read replica when one
+    is configured and usable (see _use_replica), else on the primary.
+    """
+    global _replica_down_until
+    if _use_replica():
+        try:
+            result = await _run_read(fn, replica=True)
+        except _REPLICA_ERRORS:
+            _replica_down_until = time.monotonic() + REPLICA_RETRY
+            with _pool_lock:
+                _pool_stats["replica_failures"] += 1
+        else:
+            with _pool_lock:
+                _pool_stats["replica_reads"] += 1
+            return result
+    return await _run_read(fn, replica=False)
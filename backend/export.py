@@ -0,0 +1,102 @@
+"""
+NDJSON export of the whole dataset (tags, posts, comments, votes), one JSON
+object per line with a "type" field. Rows are read with yield_per, which on
+Postgres means a server-side cursor, so memory stays flat however big the
+tables get. Posts and comments can be limited to those created since a
+timestamp for incremental exports. Votes carry no timestamp: with `since`
+they're limited to votes on the exported posts, and each post line carries
+its current score and comment_count.
+
+Serves GET /api/export; run this file directly to write an export to stdout:
+    python export.py [--since 2026-01-01T00:00:00] > export.ndjson
+"""
+import json
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Post, Comment, Vote, Tag, post_tags
+
+BATCH = 1000
+
+
+def _stream(db: Session, stmt):
+    """Yield lists of rows, BATCH at a time, without buffering the full result."""
+    return db.execute(stmt.execution_options(yield_per=BATCH)).partitions()
+
+
+def export_rows(db: Session, since: datetime | None = None) -> Iterator[dict]:
+    """Every exported row as a dict, tags first so the other lines can refer to them by slug."""
+    for rows in _stream(db, select(Tag.name, Tag.slug, Tag.color).order_by(Tag.id)):
+        for row in rows:
+            yield {"type": "tag", **row._mapping}
+
+    posts = select(
+        Post.id, Post.slug, Post.title, Post.content, Post.author_name, Post.is_true_story,
+        Post.truth_score, Post.created_at, Post.score, Post.comment_count,
+    ).order_by(Post.id)
+    if since:
+        posts = posts.where(Post.created_at >= since)
+    for rows in _stream(db, posts):
+        # tag slugs for this batch of posts in one query
+        tags: dict[int, list[str]] = {}
+        for post_id, slug in db.execute(
+            select(post_tags.c.post_id, Tag.slug)
+            .join(Tag, Tag.id == post_tags.c.tag_id)
+            .where(post_tags.c.post_id.in_([row.id for row in rows]))
+        ):
+            tags.setdefault(post_id, []).append(slug)
+        for row in rows:
+            post = dict(row._mapping)
+            # ids are local to this database; slugs identify posts across exports
+            post_id = post.pop("id")
+            yield {"type": "post", **post, "tags": tags.get(post_id, [])}
+
+    comments = (
+        select(Post.slug.label("post_slug"), Comment.author_name, Comment.content, Comment.created_at)
+        .join(Post, Post.id == Comment.post_id)
+        .order_by(Comment.id)
+    )
+    if since:
+        comments = comments.where(Comment.created_at >= since)
+    for rows in _stream(db, comments):
+        for row in rows:
+            yield {"type": "comment", **row._mapping}
+
+    votes = (
+        select(Post.slug.label("post_slug"), Vote.fingerprint, Vote.value)
+        .join(Post, Post.id == Vote.post_id)
+        .order_by(Vote.id)
+    )
+    if since:
+        votes = votes.where(Post.created_at >= since)
+    for rows in _stream(db, votes):
+        for row in rows:
+            yield {"type": "vote", **row._mapping}
+
+
+def export_ndjson(since: datetime | None = None) -> Iterator[str]:
+    """
+    NDJSON lines for a StreamingResponse. Opens its own session: the request's
+    get_db session is closed before a streamed body is sent.
+    """
+    from db import read_session_local
+
+    db = read_session_local()
+    try:
+        for row in export_rows(db, since):
+            yield json.dumps(row, default=datetime.isoformat, separators=(",", ":")) + "\n"
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Write the dataset to stdout as NDJSON.")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="only posts/comments created at or after this")
+    args = parser.parse_args()
+    sys.stdout.writelines(export_ndjson(args.since))
@@ -0,0 +1,286 @@
+"""
+Bulk NDJSON import, in the format export.py writes (tag / post / comment /
+vote lines referring to posts and tags by slug). Lines are read in batches
+of BATCH: slugs are resolved with one query per batch and each table's rows
+go in as a single executemany INSERT. A batch that hits a constraint is
+retried row by row so only the offending rows are skipped, and every batch
+is committed on its own, so a bad row never costs more than its batch.
+Rows that already exist (same tag slug, post slug, vote, or comment by the
+same author on the same post at the same time) are skipped, so re-importing
+an export is a no-op. Lines that aren't well-formed rows are skipped too.
+
+Counters, rankings, search index and stats are updated in bulk for the rows
+each batch inserted (the posts they touch, the names behind them), in that
+batch's transaction, so the cost follows the size of the import, not of the
+database, and an import that dies part way leaves no committed row
+unaccounted for. A batch that inserts nothing does no derived work at all.
+
+Serves POST /api/import; for large archives run this file directly:
+    python importer.py archive.ndjson   (or - for stdin)
+    python importer.py --rebuild        (recompute all derived data, for repairs)
+"""
+import json
+import time
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import insert, tuple_
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+import cache
+import counters
+import search
+from models import Post, Comment, Vote, Tag, post_tags
+
+BATCH = 1000
+_TYPES = ("tag", "post", "comment", "vote")
+# non-empty string fields each line type must have
+_REQUIRED = {
+    "tag": ("name", "slug"),
+    "post": ("slug", "title", "content"),
+    "comment": ("post_slug", "content"),
+    "vote": ("post_slug", "fingerprint"),
+}
+
+
+def _insert(db: Session, table, rows: list[dict]) -> list[dict]:
+    """executemany INSERT; if a row violates a constraint or doesn't fit its column, fall back to one savepoint per row. Returns the rows inserted."""
+    if not rows:
+        return []
+    try:
+        with db.begin_nested():
+            db.execute(insert(table), rows)
+        return rows
+    except (IntegrityError, DataError):
+        pass
+    inserted = []
+    for row in rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(table), [row])
+            inserted.append(row)
+        except (IntegrityError, DataError):
+            pass
+    return inserted
+
+
+def _parse_dt(value) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _clean(line) -> dict | None:
+    """The line with created_at parsed, or None if it isn't a well-formed row of a known type."""
+    if not isinstance(line, dict) or line.get("type") not in _REQUIRED:
+        return None
+    if not all(isinstance(line.get(field), str) and line[field] for field in _REQUIRED[line["type"]]):
+        return None
+    if not all(isinstance(line.get(field), (str, type(None))) for field in ("author_name", "color")):
+        return None
+    tags = line.get("tags") or []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        return None
+    if type(line.get("truth_score", 0)) not in (int, type(None)):
+        return None
+    try:
+        line["created_at"] = _parse_dt(line.get("created_at"))
+    except (TypeError, ValueError):
+        return None
+    return line
+
+
+def _post_ids(db: Session, slugs) -> dict[str, int]:
+    slugs = list(set(slugs))
+    return dict(db.query(Post.slug, Post.id).filter(Post.slug.in_(slugs))) if slugs else {}
+
+
+def _import_batch(db: Session, lines: list[dict], tag_ids: dict[str, int], counts: dict) -> dict:
+    """Insert one batch. Returns what it inserted, for _update_derived."""
+    by_type = {t: [] for t in _TYPES}
+    for line in lines:
+        by_type[line["type"]].append(line)
+
+    # tags: new slugs only
+    new_tags = {t["slug"]: t for t in by_type["tag"] if t["slug"] not in tag_ids}
+    tags = _insert(db, Tag.__table__, [
+        {"name": t["name"], "slug": t["slug"], "color": t.get("color") or "#666666"} for t in new_tags.values()
+    ])
+    counts["tag"] += len(tags)
+    counts["skipped"] += len(by_type["tag"]) - len(tags)
+    if new_tags:
+        tag_ids.update(db.query(Tag.slug, Tag.id).filter(Tag.slug.in_(list(new_tags))))
+
+    # posts: skip slugs that already exist, then link tags by the new ids
+    existing = _post_ids(db, [p["slug"] for p in by_type["post"]])
+    new_posts = {p["slug"]: p for p in by_type["post"] if p["slug"] not in existing}
+    posts = _insert(db, Post.__table__, [
+        {
+            "slug": p["slug"],
+            "title": p["title"],
+            "content": p["content"],
+            "author_name": p.get("author_name") or "anonymous",
+            "is_true_story": bool(p.get("is_true_story")),
+            "truth_score": p.get("truth_score") or 0,
+            "created_at": p["created_at"] or datetime.now(timezone.utc),
+        }
+        for p in new_posts.values()
+    ])
+    counts["post"] += len(posts)
+    counts["skipped"] += len(by_type["post"]) - len(posts)
+    new_post_ids = _post_ids(db, [p["slug"] for p in posts])
+    _insert(db, post_tags, [
+        {"post_id": new_post_ids[slug], "tag_id": tag_ids[tag]}
+        for slug, p in new_posts.items() if slug in new_post_ids
+        for tag in dict.fromkeys(p.get("tags") or []) if tag in tag_ids
+    ])
+
+    # comments and votes: resolve their posts in one query
+    post_ids = _post_ids(db, [r["post_slug"] for r in by_type["comment"] + by_type["vote"]])
+    comments = [
+        {
+            "post_id": post_ids[c["post_slug"]],
+            "author_name": c.get("author_name") or "anonymous",
+            "content": c["content"],
+            "created_at": c["created_at"] or datetime.now(timezone.utc),
+        }
+        for c in by_type["comment"] if c["post_slug"] in post_ids
+    ]
+    if comments:
+        # comments have no unique key; (post, author, created_at) identifies one across exports
+        keys = {(c["post_id"], c["author_name"], c["created_at"]) for c in comments}
+        existing = set(
+            db.query(Comment.post_id, Comment.author_name, Comment.created_at)
+            .filter(tuple_(Comment.post_id, Comment.author_name, Comment.created_at).in_(list(keys)))
+        )
+        comments = [c for c in comments if (c["post_id"], c["author_name"], c["created_at"]) not in existing]
+    comments = _insert(db, Comment.__table__, comments)
+    counts["comment"] += len(comments)
+    counts["skipped"] += len(by_type["comment"]) - len(comments)
+
+    votes = {
+        (post_ids[v["post_slug"]], v["fingerprint"]): v["value"]
+        for v in by_type["vote"] if v["post_slug"] in post_ids and v.get("value") in (1, -1)
+    }
+    if votes:
+        for key in db.query(Vote.post_id, Vote.fingerprint).filter(tuple_(Vote.post_id, Vote.fingerprint).in_(list(votes))):
+            votes.pop(tuple(key), None)
+    votes = _insert(db, Vote.__table__, [
+        {"post_id": post_id, "fingerprint": fp, "value": value} for (post_id, fp), value in votes.items()
+    ])
+    counts["vote"] += len(votes)
+    counts["skipped"] += len(by_type["vote"]) - len(votes)
+    return {"tags": tags, "posts": posts, "post_ids": new_post_ids.values(), "comments": comments, "votes": votes}
+
+
+def _update_derived(db: Session, inserted: dict):
+    """Bring counters, rankings, stats and the search index up to date with one batch's inserts."""
+    post_ids = {
+        *inserted["post_ids"],
+        *(c["post_id"] for c in inserted["comments"]),
+        *(v["post_id"] for v in inserted["votes"]),
+    }
+    if post_ids:
+        counters.recalc_post_counters(db, post_ids)
+        counters.refresh_hot_scores(db, post_ids=post_ids)
+        counters.rebuild_post_ranks(db, post_ids)
+        search.index_posts(db, post_ids)
+    counters.record_bulk(db, len(inserted["tags"]), inserted["posts"], inserted["comments"], inserted["votes"])
+    cache.bump_data_version(db)
+
+
+def rebuild_derived(db: Session):
+    """Recompute all derived data from the base tables (repairs; see --rebuild)."""
+    counters.recalc_post_counters(db)
+    counters.refresh_hot_scores(db)
+    counters.rebuild_post_ranks(db)
+    counters.rebuild_site_stats(db)
+    counters.rebuild_user_stats(db)
+    search.rebuild(db)
+    cache.bump_data_version(db)
+    db.commit()
+
+
+def import_lines(db: Session, lines: Iterable[str | bytes]) -> dict:
+    """
+    Import NDJSON lines, committing every BATCH lines together with the derived
+    data for them. Lines that aren't valid JSON or well-formed rows are counted
+    as skipped. Returns counts, the insert rate and the time spent on derived data.
+    """
+    started = time.perf_counter()
+    counts = {t: 0 for t in _TYPES} | {"skipped": 0}
+    tag_ids = dict(db.query(Tag.slug, Tag.id))
+    total = 0
+    derived_seconds = 0.0
+    batch = []
+
+    def flush():
+        nonlocal derived_seconds
+        inserted = _import_batch(db, batch, tag_ids, counts)
+        if any(inserted[key] for key in ("tags", "posts", "comments", "votes")):
+            derived_started = time.perf_counter()
+            _update_derived(db, inserted)
+            derived_seconds += time.perf_counter() - derived_started
+        db.commit()
+        batch.clear()
+
+    try:
+        for raw in lines:
+            if not raw.strip():
+                continue
+            total += 1
+            try:
+                line = _clean(json.loads(raw))
+            except ValueError:
+                line = None
+            if line is None:
+                counts["skipped"] += 1
+                continue
+            batch.append(line)
+            if len(batch) >= BATCH:
+                flush()
+        if batch:
+            flush()
+    except BaseException:
+        # the failed batch's rows and derived data go together; earlier batches are complete
+        db.rollback()
+        raise
+
+    seconds = time.perf_counter() - started
+    insert_seconds = seconds - derived_seconds
+    return {
+        "rows": total,
+        "inserted": {t: counts[t] for t in _TYPES},
+        "skipped": counts["skipped"],
+        "seconds": round(seconds, 2),
+        "rows_per_sec": round(total / insert_seconds) if insert_seconds else total,
+        "derived_seconds": round(derived_seconds, 2),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from db import session_local, engine
+    from models import Base
+    import migrations
+
+    parser = argparse.ArgumentParser(description="Import an NDJSON archive (export.py format).")
+    parser.add_argument("archive", nargs="?", help="NDJSON file, or - for stdin")
+    parser.add_argument("--rebuild", action="store_true", help="recompute all derived data from the base tables")
+    args = parser.parse_args()
+    if not args.archive and not args.rebuild:
+        parser.error("give an archive, --rebuild, or both")
+    Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
+    db = session_local()
+    try:
+        if args.archive:
+            with (sys.stdin if args.archive == "-" else open(args.archive, encoding="utf-8")) as f:
+                print(json.dumps(import_lines(db, f)))
+        if args.rebuild:
+            started = time.perf_counter()
+            rebuild_derived(db)
+            print(f"derived data rebuilt in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
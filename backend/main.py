@@ -1,29 +1,44 @@
 import sys
 import os
+import time
+
+_import_started = time.perf_counter()
 
 # make sure imports work when running from backend/
 sys.path.insert(0, os.path.dirname(__file__))
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from db import engine, session_local
+from db import engine, session_local, read_primary
 from models import Base
-import seed
+import migrations
 
-from routers import posts, comments, votes, tags, stats, regulars, users, cron
+from routers import posts, comments, votes, batch, tags, stats, regulars, users, search, cron, export, importer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
-    db = session_local()
-    try:
-        seed.run(db)
-    finally:
-        db.close()
+    started = time.perf_counter()
+    # warm database: schema and seed markers in one query, nothing else to do
+    warm = migrations.is_current(engine)
+    if not warm:
+        import seed  # only needed to set up a new or outdated database
+
+        Base.metadata.create_all(bind=engine)
+        migrations.upgrade(engine)
+        db = session_local()
+        try:
+            seed.run(db)
+        finally:
+            db.close()
+    now = time.perf_counter()
+    print(
+        f"cold start: imports {(started - _import_started) * 1000:.0f}ms, "
+        f"{'warm database' if warm else 'schema/seed setup'} {(now - started) * 1000:.0f}ms"
+    )
     yield
 
 
@@ -42,14 +57,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def read_primary_header(request: Request, call_next):
+    # X-Read-Primary: 1 sends this request's reads to the primary (read-your-writes after a script's write)
+    if request.headers.get("x-read-primary") == "1":
+        read_primary.set(True)
+    return await call_next(request)
+
 app.include_router(posts.router)
 app.include_router(comments.router)
 app.include_router(votes.router)
+app.include_router(batch.router)
 app.include_router(tags.router)
 app.include_router(stats.router)
 app.include_router(regulars.router)
 app.include_router(users.router)
+app.include_router(search.router)
 app.include_router(cron.router)
+app.include_router(export.router)
+app.include_router(importer.router)
 
 # Serve Vue SPA (built frontend) - mount last so /api routes take precedence
 _frontend_dist = os.path.join(os.path.dirname(__file__), "..", "frontend", "dist")
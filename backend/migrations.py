@@ -0,0 +1,171 @@
+"""
+Versioned schema migrations.
+create_all only creates missing tables, so anything added to an existing table
+(columns, indexes) needs a migration here to reach databases that already exist,
+e.g. the production Neon database. Each migration is idempotent, so a fresh
+database built by create_all simply records them all as applied.
+
+Migrations may run long after they were written, against a schema several
+versions behind, so they name the columns and indexes they touch instead of
+iterating whatever models.py declares today.
+
+Run `python migrations.py` to apply pending migrations to DATABASE_URL.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+import counters
+import search
+from models import Post, PostRank, SiteStats, UserStats, Comment, Vote, post_tags
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _add_columns(conn, table: str, columns: dict[str, str]):
+    """ALTER TABLE ADD COLUMN for each name -> DDL type that the table doesn't have yet."""
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    for name, ddl in columns.items():
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def _create_indexes(conn, table, names: list[str]):
+    """Create the named indexes declared on `table` in models.py, skipping existing ones."""
+    by_name = {index.name: index for index in table.indexes}
+    for name in names:
+        by_name[name].create(conn, checkfirst=True)
+
+
+def _post_counters(conn):
+    """Post.score / Post.comment_count, backfilled from votes and comments."""
+    _add_columns(conn, "posts", {
+        "score": "INTEGER NOT NULL DEFAULT 0",
+        "comment_count": "INTEGER NOT NULL DEFAULT 0",
+    })
+    counters.recalc_post_counters(Session(bind=conn))
+
+
+def _hot_query_indexes(conn):
+    """Composite indexes matching the router access paths."""
+    _create_indexes(conn, Post.__table__, [
+        "ix_posts_created", "ix_posts_score", "ix_posts_comment_count", "ix_posts_author_created",
+    ])
+    _create_indexes(conn, Comment.__table__, ["ix_comments_post_created", "ix_comments_author_created"])
+    _create_indexes(conn, Vote.__table__, ["ix_votes_fingerprint"])
+    _create_indexes(conn, post_tags, ["ix_post_tags_tag"])
+
+
+def _post_ranks(conn):
+    """Per-tag ranking rows for tag-filtered sorts, filled from the post counters."""
+    PostRank.__table__.create(conn, checkfirst=True)
+    conn.execute(text(
+        "INSERT INTO post_ranks (tag_id, post_id, created_at, score, comment_count) "
+        "SELECT post_tags.tag_id, posts.id, posts.created_at, posts.score, posts.comment_count "
+        "FROM posts JOIN post_tags ON post_tags.post_id = posts.id"
+    ))
+
+
+def _search_index(conn):
+    """Full-text search index (FTS5 / tsvector + GIN), filled from existing posts."""
+    search.create_index(conn)
+    search.rebuild(Session(bind=conn))
+
+
+def _hot_scores(conn):
+    """hot_score on posts and post_ranks for sort=hot, with its first refresh."""
+    _add_columns(conn, "posts", {"hot_score": "FLOAT NOT NULL DEFAULT 0"})
+    _add_columns(conn, "post_ranks", {"hot_score": "FLOAT NOT NULL DEFAULT 0"})
+    _create_indexes(conn, Post.__table__, ["ix_posts_hot"])
+    _create_indexes(conn, PostRank.__table__, ["ix_post_ranks_hot"])
+    counters.refresh_hot_scores(Session(bind=conn))
+
+
+def _site_stats(conn):
+    """Snapshot row for /api/stats, counted once from the base tables."""
+    SiteStats.__table__.create(conn, checkfirst=True)
+    db = Session(bind=conn)
+    counters.rebuild_site_stats(db)
+    db.flush()
+
+
+def _user_stats(conn):
+    """Per-author counters for the regulars endpoints, counted once from the base tables."""
+    UserStats.__table__.create(conn, checkfirst=True)
+    counters.rebuild_user_stats(Session(bind=conn))
+
+
+def _post_ranks_by_post(conn):
+    """Index post_ranks by post_id (the primary key leads with tag_id)."""
+    _create_indexes(conn, PostRank.__table__, ["ix_post_ranks_post"])
+
+
+# bump whenever seed.run() gains a step existing databases need, so the next boot runs it
+SEED_VERSION = 1
+
+# (version, name, fn) — append only, never renumber
+MIGRATIONS = [
+    (1, "post counters", _post_counters),
+    (2, "hot query indexes", _hot_query_indexes),
+    (3, "post ranks", _post_ranks),
+    (4, "search index", _search_index),
+    (5, "hot scores", _hot_scores),
+    (6, "site stats", _site_stats),
+    (7, "user stats", _user_stats),
+    (8, "post ranks by post", _post_ranks_by_post),
+]
+
+
+def is_current(engine) -> bool:
+    """
+    One round trip: are all migrations applied and the seed at SEED_VERSION?
+    A fresh database (no tables yet) is simply not current.
+    """
+    try:
+        with engine.connect() as conn:
+            schema, seeded = conn.execute(text(
+                "SELECT (SELECT max(version) FROM schema_migrations), "
+                "(SELECT value FROM app_meta WHERE key = 'seed_version')"
+            )).one()
+    except DBAPIError:
+        return False
+    return schema == MIGRATIONS[-1][0] and seeded == SEED_VERSION
+
+
+def upgrade(engine) -> list[int]:
+    """Apply pending migrations, each in its own transaction. Returns applied versions."""
+    _meta.create_all(bind=engine)
+    with engine.connect() as conn:
+        done = set(conn.scalars(select(schema_migrations.c.version)))
+
+    applied = []
+    for version, name, fn in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=version,
+                name=name,
+                applied_at=datetime.now(timezone.utc),
+            ))
+        applied.append(version)
+    return applied
+
+
+if __name__ == "__main__":
+    from db import engine
+    from models import Base
+
+    Base.metadata.create_all(bind=engine)
+    applied = upgrade(engine)
+    print(f"applied migrations: {applied}" if applied else "database is up to date")
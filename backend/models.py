@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Table, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, String, Text, Boolean, DateTime, ForeignKey, Table, UniqueConstraint, Index
 from sqlalchemy.orm import relationship, DeclarativeBase
 from datetime import datetime, timezone
 
@@ -12,6 +12,8 @@ post_tags = Table(
     Base.metadata,
     Column("post_id", Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # the PK leads with post_id; tag pages filter the other way round
+    Index("ix_post_tags_tag", "tag_id", "post_id"),
 )
 
 
@@ -26,10 +28,25 @@ class Post(Base):
     is_true_story = Column(Boolean, default=False)
     truth_score = Column(Integer, default=0)  # 0-100
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # denormalized counters, kept in sync by counters.py on every write
+    score = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # time-decayed rank for sort=hot, refreshed periodically by counters.refresh_hot_scores
+    hot_score = Column(Float, nullable=False, default=0, server_default="0")
 
     tags = relationship("Tag", secondary=post_tags, back_populates="posts")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
     votes = relationship("Vote", back_populates="post", cascade="all, delete-orphan")
+    ranks = relationship("PostRank", cascade="all, delete-orphan")
+
+    # one index per list ordering (with id as the keyset tie-breaker) + profile lookups
+    __table_args__ = (
+        Index("ix_posts_created", "created_at", "id"),
+        Index("ix_posts_score", "score", "id"),
+        Index("ix_posts_comment_count", "comment_count", "id"),
+        Index("ix_posts_hot", "hot_score", "id"),
+        Index("ix_posts_author_created", "author_name", "created_at"),
+    )
 
 
 class Tag(Base):
@@ -43,6 +60,27 @@ class Tag(Base):
     posts = relationship("Post", secondary=post_tags, back_populates="tags")
 
 
+class PostRank(Base):
+    """Per-tag copy of a post's sort keys, so tag pages are index-ordered range reads."""
+    __tablename__ = "post_ranks"
+
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime)
+    score = Column(Integer, nullable=False, default=0)
+    comment_count = Column(Integer, nullable=False, default=0)
+    hot_score = Column(Float, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_post_ranks_created", "tag_id", "created_at", "post_id"),
+        Index("ix_post_ranks_score", "tag_id", "score", "post_id"),
+        Index("ix_post_ranks_comment_count", "tag_id", "comment_count", "post_id"),
+        Index("ix_post_ranks_hot", "tag_id", "hot_score", "post_id"),
+        # a post's own rows (Post.ranks on writes, per-post refreshes in bulk imports)
+        Index("ix_post_ranks_post", "post_id"),
+    )
+
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -54,6 +92,11 @@ class Comment(Base):
 
     post = relationship("Post", back_populates="comments")
 
+    __table_args__ = (
+        Index("ix_comments_post_created", "post_id", "created_at"),
+        Index("ix_comments_author_created", "author_name", "created_at"),
+    )
+
 
 class Vote(Base):
     __tablename__ = "votes"
@@ -67,4 +110,36 @@ class Vote(Base):
 
     __table_args__ = (
         UniqueConstraint("post_id", "fingerprint", name="uq_vote_post_fingerprint"),
+        Index("ix_votes_fingerprint", "fingerprint"),
     )
+
+
+class SiteStats(Base):
+    """Single-row (id=1) snapshot of site totals, kept current by counters.py."""
+    __tablename__ = "site_stats"
+
+    id = Column(Integer, primary_key=True)
+    total_posts = Column(Integer, nullable=False, default=0)
+    total_comments = Column(Integer, nullable=False, default=0)
+    total_votes = Column(Integer, nullable=False, default=0)
+    total_tags = Column(Integer, nullable=False, default=0)
+    last_post_at = Column(DateTime)
+
+
+class UserStats(Base):
+    """Per-author activity counters, kept current by counters.py."""
+    __tablename__ = "user_stats"
+
+    name = Column(String(100), primary_key=True)
+    post_count = Column(Integer, nullable=False, default=0)
+    comment_count = Column(Integer, nullable=False, default=0)
+    votes_cast = Column(Integer, nullable=False, default=0)  # only known for regulars (fingerprint -> name)
+    last_active_at = Column(DateTime)
+
+
+class AppMeta(Base):
+    """Small integer key/value store for process-wide markers (e.g. data_version)."""
+    __tablename__ = "app_meta"
+
+    key = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,34 @@
+"""
+Opaque keyset cursors: a urlsafe base64 JSON blob of (scope, sort key, id).
+The scope stops a cursor minted for one ordering being replayed against another.
+"""
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+def encode_cursor(scope: str, key, row_id: int) -> str:
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps([scope, key, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str, key_type: type = int) -> tuple:
+    """Return (key, id) from a cursor, or raise 400 if it's malformed or for another scope."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_scope, key, row_id = json.loads(raw)
+        if cursor_scope != scope or type(row_id) is not int:
+            raise ValueError(cursor_scope)
+        if key_type is datetime:
+            key = datetime.fromisoformat(key)
+        elif key_type is float and type(key) in (int, float):
+            key = float(key)
+        elif type(key) is not key_type:
+            raise ValueError(key)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "invalid cursor")
+    return key, row_id
@@ -0,0 +1,103 @@
+"""
+Import-time profile of the API entry point (api/index.py), the code every
+Vercel cold start runs before it can serve a request. Runs a fresh
+interpreter with `python -X importtime` and reports the slowest modules.
+
+    python backend/profile_startup.py              # top 25 modules by cumulative time
+    python backend/profile_startup.py --check      # exit 1 if over budget
+
+--check fails when the entry point's own share of the import time takes
+longer than --budget ms (STARTUP_BUDGET_MS, default 150), or when it pulls
+in a module that only the cron / write paths need (READ_PATH_EXCLUDED).
+The own share leaves out the FRAMEWORK packages, which every version of
+the app pays for alike, so the budget tracks what this repo's code and
+its other dependencies add. It is the best of --runs imports, so one slow
+run on a busy machine doesn't fail the check. tests/test_startup.py runs
+the same check.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY = "api.index"
+# loaded on demand by the routes that need them, never at startup
+READ_PATH_EXCLUDED = ("cron_generate", "groq", "seed", "slugify")
+# imported by every version of the app; not counted against the budget
+FRAMEWORK = ("fastapi", "starlette", "pydantic", "pydantic_core", "sqlalchemy")
+BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "150"))
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile() -> list[tuple[str, int, int, int]]:
+    """(module, self µs, cumulative µs, nesting depth) for every module imported by ENTRY."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((m[4], int(m[1]), int(m[2]), len(m[3]) // 2))
+    return rows
+
+
+def app_ms(rows: list[tuple[str, int, int, int]]) -> float:
+    """Cumulative import time of ENTRY minus the FRAMEWORK subtrees in it, in ms."""
+    total = next(cumulative for name, _, cumulative, _ in rows if name == ENTRY)
+    # -X importtime lists children before their parent; walked in reverse, parents come first
+    framework, stack = 0, []
+    for name, _, cumulative, depth in reversed(rows):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        inside = bool(stack) and stack[-1][1]
+        is_framework = name.split(".")[0] in FRAMEWORK
+        if is_framework and not inside:
+            framework += cumulative
+        stack.append((depth, inside or is_framework))
+    return (total - framework) / 1000
+
+
+def check(budget: float = BUDGET_MS, runs: int = 3) -> list[str]:
+    """Budget failures for the read-path startup (empty if it's within budget)."""
+    failures = []
+    measured = []
+    for _ in range(runs):
+        rows = profile()
+        measured.append(app_ms(rows))
+        excluded = [name for name in READ_PATH_EXCLUDED if name in {name for name, *_ in rows}]
+        if excluded:
+            return [f"read-path startup imports {', '.join(excluded)}"]
+    if min(measured) > budget:
+        failures.append(f"startup imports took {min(measured):.0f}ms outside {', '.join(FRAMEWORK)}, over the {budget:.0f}ms budget")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--check", action="store_true", help="exit 1 if over budget or an excluded module loads")
+    parser.add_argument("--budget", type=float, default=BUDGET_MS, help="ms outside FRAMEWORK")
+    parser.add_argument("--runs", type=int, default=3, help="--check takes the best of this many imports")
+    args = parser.parse_args()
+
+    rows = profile()
+    total_ms = next(cumulative for name, _, cumulative, _ in rows if name == ENTRY) / 1000
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for name, self_us, cumulative, depth in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:>14.1f} {self_us / 1000:>8.1f}  {'  ' * depth}{name}")
+    print(f"\n{ENTRY}: {total_ms:.0f}ms, {app_ms(rows):.0f}ms outside the framework (budget {args.budget:.0f}ms)")
+
+    if args.check:
+        failures = check(args.budget, args.runs)
+        if failures:
+            sys.exit("FAIL: " + "; ".join(failures))
+        print("OK")
+
+
+if __name__ == "__main__":
+    main()
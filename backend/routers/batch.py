@@ -0,0 +1,81 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, selectinload
+
+from db import run_read
+from models import Post
+from schemas import post_detail, posts_batch, vote_summary, votes_batch
+from cache import cached
+
+# under /api/batch, not /api/posts, so they can't shadow a post slugged "batch" or "votes"
+router = APIRouter(prefix="/api/batch", tags=["batch"])
+
+MAX_BATCH = 100
+
+
+def parse_batch(raw: str, cast=str) -> list:
+    """Split a comma-separated batch param into unique values, keeping request order."""
+    try:
+        values = list(dict.fromkeys(cast(v.strip()) for v in raw.split(",") if v.strip()))
+    except ValueError:
+        raise HTTPException(400, "invalid batch value")
+    if len(values) > MAX_BATCH:
+        raise HTTPException(400, f"at most {MAX_BATCH} items per batch")
+    return values
+
+
+@router.get("/posts", response_model=posts_batch)
+async def get_posts_batch(
+    request: Request,
+    response: Response,
+    slugs: str = Query(..., max_length=MAX_BATCH * 81),
+):
+    """Several posts by slug in one IN query; unknown slugs are listed in `missing`."""
+    wanted = parse_batch(slugs)
+    return await run_read(lambda db: cached(
+        request, response, db, lambda: _get_posts_batch(db, wanted),
+        max_age=60, swr=3600, slugs=tuple(wanted),
+    ))
+
+
+def _get_posts_batch(db: Session, slugs: list[str]) -> posts_batch:
+    found = {
+        p.slug: p
+        for p in db.query(Post).options(selectinload(Post.tags)).filter(Post.slug.in_(slugs)).all()
+    } if slugs else {}
+    return posts_batch(
+        items=[post_detail.model_validate(found[s]) for s in slugs if s in found],
+        missing=[s for s in slugs if s not in found],
+    )
+
+
+@router.get("/votes", response_model=votes_batch)
+async def get_votes_batch(
+    request: Request,
+    response: Response,
+    ids: str = Query(..., max_length=MAX_BATCH * 11),
+):
+    """Vote summaries and comment counts for several posts in one IN query."""
+    wanted = parse_batch(ids, int)
+    return await run_read(lambda db: cached(
+        request, response, db, lambda: _get_votes_batch(db, wanted),
+        max_age=60, swr=3600, ids=tuple(wanted),
+    ))
+
+
+def _get_votes_batch(db: Session, ids: list[int]) -> votes_batch:
+    found = {
+        row.id: row
+        for row in db.query(Post.id, Post.score, Post.comment_count, Post.truth_score).filter(Post.id.in_(ids)).all()
+    } if ids else {}
+    return votes_batch(
+        items=[
+            vote_summary(
+                post_id=i,
+                score=found[i].score,
+                comment_count=found[i].comment_count,
+                truth_score=found[i].truth_score,
+            )
+            for i in ids if i in found
+        ],
+        missing=[i for i in ids if i not in found],
+    )
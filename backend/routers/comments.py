@@ -1,17 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from sqlalchemy import and_, tuple_
 from sqlalchemy.orm import Session
 
-from db import get_db
+from db import run_read
 from models import Post, Comment
 from schemas import comment_out
+from pagination import encode_cursor, decode_cursor
+from cache import cached
 
 router = APIRouter(prefix="/api/posts", tags=["comments"])
 
+COMMENTS_PAGE = 50
+
 
 @router.get("/{post_id}/comments", response_model=list[comment_out])
-def list_comments(post_id: int, db: Session = Depends(get_db)):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
+async def list_comments(
+    post_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(COMMENTS_PAGE, ge=1, le=200),
+    after: str | None = Query(None, max_length=200),
+):
+    """
+    Oldest first, `limit` at a time. X-Total-Count carries the post's comment
+    count and X-Next-Cursor the `after` value for the next page (absent on the last).
+    """
+    after_key = decode_cursor(after, "comments", datetime) if after else None
+    page = await run_read(lambda db: cached(
+        request, response, db, lambda: comment_page(db, post_id, limit, after_key),
+        max_age=60, swr=3600, limit=limit, after=after,
+    ))
+    if isinstance(page, Response):
+        return page
+    response.headers["X-Total-Count"] = str(page["total"])
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
+
+
+def comment_page(db: Session, post_id: int, limit: int, after: tuple | None = None) -> dict:
+    """
+    One page of a post's comments plus its maintained comment_count, in one
+    statement: the post is outer-joined so a missing post (no rows) is a 404
+    and a post without (further) comments is a single row of NULLs.
+    """
+    join_on = Comment.post_id == Post.id
+    if after:
+        join_on = and_(join_on, tuple_(Comment.created_at, Comment.id) > after)
+    rows = (
+        db.query(Post.comment_count, Comment)
+        .select_from(Post)
+        .outerjoin(Comment, join_on)
+        .filter(Post.id == post_id)
+        .order_by(Comment.created_at.asc(), Comment.id.asc())
+        .limit(limit + 1)
+        .all()
+    )
+    if not rows:
         raise HTTPException(404, "post not found")
-    comments = db.query(Comment).filter(Comment.post_id == post_id).order_by(Comment.created_at.asc()).all()
-    return comments
+    comments = [c for _, c in rows if c is not None]
+    has_more = len(comments) > limit
+    comments = comments[:limit]
+    return {
+        "items": [comment_out.model_validate(c) for c in comments],
+        "total": rows[0].comment_count,
+        "next_cursor": encode_cursor("comments", comments[-1].created_at, comments[-1].id) if has_more else None,
+    }
@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from db import get_db
-from cron_generate import run_cron_generate
+import counters
+import cache
 
 router = APIRouter(prefix="/api/cron", tags=["cron"])
 
@@ -24,5 +25,19 @@ def cron_generate_posts(request: Request, db: Session = Depends(get_db)):
     """Cron endpoint: generate fake/real football news via Groq. Secured by CRON_SECRET."""
     if not _verify_cron_secret(request):
         raise HTTPException(status_code=401, detail="Unauthorized")
+    # imported here so the Groq client / RSS stack only loads on the cron instance, not on reads
+    from cron_generate import run_cron_generate
+
     result = run_cron_generate(db)
     return result
+
+
+@router.get("/refresh-hot")
+def cron_refresh_hot(request: Request, db: Session = Depends(get_db)):
+    """Cron endpoint: re-decay hot_score so sort=hot tracks post age between generate runs."""
+    if not _verify_cron_secret(request):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    scored = counters.refresh_hot_scores(db)
+    cache.bump_data_version(db)
+    db.commit()
+    return {"ok": True, "scored": scored}
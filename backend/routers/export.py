@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from export import export_ndjson
+from routers.cron import _verify_cron_secret
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+
+@router.get("")
+def export_dataset(request: Request, since: datetime | None = Query(None)):
+    """Stream tags, posts, comments and votes as NDJSON. Secured by CRON_SECRET."""
+    if not _verify_cron_secret(request):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return StreamingResponse(export_ndjson(since), media_type="application/x-ndjson")
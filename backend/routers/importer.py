@@ -0,0 +1,28 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from db import session_local
+from importer import import_lines
+from routers.cron import _verify_cron_secret
+
+router = APIRouter(prefix="/api/import", tags=["import"])
+
+
+def _run_import(lines: list[bytes]) -> dict:
+    db = session_local()
+    try:
+        return import_lines(db, lines)
+    finally:
+        db.close()
+
+
+@router.post("")
+async def import_dataset(request: Request):
+    """
+    Bulk-import an NDJSON body (export.py format). Secured by CRON_SECRET.
+    Request bodies are capped by the platform, so use importer.py for big archives.
+    """
+    if not _verify_cron_secret(request):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    body = await request.body()
+    return await run_in_threadpool(_run_import, body.splitlines())
@@ -1,100 +1,119 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, outerjoin
+from fastapi import APIRouter, Query, HTTPException, Request, Response
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import desc, select, tuple_
+from datetime import datetime
 
-from db import get_db
-from models import Post, Vote, Comment
-from schemas import post_brief, post_detail, paginated_posts
+from db import run_read
+from models import Post, PostRank, Tag
+from schemas import post_brief, post_detail, paginated_posts, vote_out, post_page
+from pagination import encode_cursor, decode_cursor
+from cache import cached
+from routers.comments import COMMENTS_PAGE, comment_page
 
 router = APIRouter(prefix="/api/posts", tags=["posts"])
 
-
 def _enrich(db: Session, posts: list) -> list[post_brief]:
-    if not posts:
-        return []
-    ids = [p.id for p in posts]
-    scores = {
-        row[0]: row[1]
-        for row in db.query(Vote.post_id, func.coalesce(func.sum(Vote.value), 0))
-        .filter(Vote.post_id.in_(ids))
-        .group_by(Vote.post_id)
-        .all()
-    }
-    counts = {
-        row[0]: row[1]
-        for row in db.query(Comment.post_id, func.count(Comment.id))
-        .filter(Comment.post_id.in_(ids))
-        .group_by(Comment.post_id)
-        .all()
-    }
-    result = []
-    for p in posts:
-        d = post_brief.model_validate(p)
-        d.score = scores.get(p.id, 0)
-        d.comment_count = counts.get(p.id, 0)
-        result.append(d)
-    return result
+    # score and comment_count are denormalized onto Post (see counters.py)
+    return [post_brief.model_validate(p) for p in posts]
+
+
+# sort mode -> keyset column on posts, and its mirror on post_ranks for tag pages;
+# the post id breaks ties so (key, id) is unique
+_SORT_KEYS = {
+    "new": (Post.created_at, PostRank.created_at),
+    "top": (Post.score, PostRank.score),
+    "discussed": (Post.comment_count, PostRank.comment_count),
+    "hot": (Post.hot_score, PostRank.hot_score),
+}
+_KEY_TYPES = {"new": datetime, "top": int, "discussed": int, "hot": float}
 
 
 @router.get("", response_model=paginated_posts)
-def list_posts(
-    sort: str = Query("new", pattern="^(new|top|discussed)$"),
+async def list_posts(
+    request: Request,
+    response: Response,
+    sort: str = Query("new", pattern="^(new|top|discussed|hot)$"),
     tag: str | None = Query(None, max_length=50),
     page: int = Query(1, ge=1),
     per_page: int = Query(5, ge=1, le=50),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, max_length=200),
 ):
-    q = db.query(Post)
+    return await run_read(lambda db: cached(
+        request, response, db, lambda: _list_posts(db, sort, tag, page, per_page, cursor),
+        max_age=30, swr=300, sort=sort, tag=tag, page=page, per_page=per_page, cursor=cursor,
+    ))
+
+
+def _list_posts(db: Session, sort: str, tag: str | None, page: int, per_page: int, cursor: str | None) -> paginated_posts:
+    post_key, rank_key = _SORT_KEYS[sort]
     if tag:
-        q = q.filter(Post.tags.any(slug=tag))
+        # tag pages walk that tag's ranking rows in index order (see counters.py)
+        key_col, id_col = rank_key, PostRank.post_id
+        tag_id = select(Tag.id).where(Tag.slug == tag).scalar_subquery()
+        q = db.query(Post, key_col).join(PostRank, PostRank.post_id == Post.id).filter(PostRank.tag_id == tag_id)
+    else:
+        key_col, id_col = post_key, Post.id
+        q = db.query(Post, key_col)
+    # the key column rides along so cursors carry the value the keyset filter compares
+    q = q.options(selectinload(Post.tags)).order_by(desc(key_col), desc(id_col))
 
+    if cursor:
+        # keyset mode: no COUNT, no OFFSET — cost is the same on every page
+        key, last_id = decode_cursor(cursor, sort, _KEY_TYPES[sort])
+        rows = q.filter(tuple_(key_col, id_col) < (key, last_id)).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        return paginated_posts(
+            items=_enrich(db, [post for post, _ in rows]),
+            next_cursor=_next_cursor(sort, rows) if has_more else None,
+        )
+
+    # page mode (compatibility): total/pages for numbered pagination
     total = q.count()
     pages = max(1, -(-total // per_page))
-    offset = (page - 1) * per_page
+    rows = q.offset((page - 1) * per_page).limit(per_page).all()
+    return paginated_posts(
+        items=_enrich(db, [post for post, _ in rows]),
+        total=total,
+        page=page,
+        pages=pages,
+        next_cursor=_next_cursor(sort, rows) if page < pages else None,
+    )
 
-    if sort == "new":
-        posts = q.order_by(desc(Post.created_at)).offset(offset).limit(per_page).all()
 
-    elif sort == "top":
-        vote_sum = (
-            db.query(Vote.post_id, func.coalesce(func.sum(Vote.value), 0).label("score"))
-            .group_by(Vote.post_id)
-            .subquery()
-        )
-        posts = (
-            q.outerjoin(vote_sum, Post.id == vote_sum.c.post_id)
-            .order_by(desc(func.coalesce(vote_sum.c.score, 0)))
-            .offset(offset)
-            .limit(per_page)
-            .all()
-        )
+def _next_cursor(sort: str, rows: list) -> str | None:
+    """Cursor after the last (post, key) row of a page."""
+    if not rows:
+        return None
+    post, key = rows[-1]
+    return encode_cursor(sort, key, post.id)
 
-    elif sort == "discussed":
-        comment_count = (
-            db.query(Comment.post_id, func.count(Comment.id).label("cnt"))
-            .group_by(Comment.post_id)
-            .subquery()
-        )
-        posts = (
-            q.outerjoin(comment_count, Post.id == comment_count.c.post_id)
-            .order_by(desc(func.coalesce(comment_count.c.cnt, 0)))
-            .offset(offset)
-            .limit(per_page)
-            .all()
-        )
 
-    items = _enrich(db, posts)
-    return paginated_posts(items=items, total=total, page=page, pages=pages)
+@router.get("/{slug}", response_model=post_detail)
+async def get_post(slug: str, request: Request, response: Response):
+    return await run_read(lambda db: cached(request, response, db, lambda: _get_post(db, slug), max_age=60, swr=3600))
 
 
-@router.get("/{slug}", response_model=post_detail)
-def get_post(slug: str, db: Session = Depends(get_db)):
-    post = db.query(Post).filter(Post.slug == slug).first()
+def _get_post(db: Session, slug: str) -> post_detail:
+    post = db.query(Post).options(selectinload(Post.tags)).filter(Post.slug == slug).first()
     if not post:
         raise HTTPException(404, "post not found")
 
-    enriched = _enrich(db, [post])
-    d = post_detail.model_validate(post)
-    d.score = enriched[0].score
-    d.comment_count = enriched[0].comment_count
-    return d
+    return post_detail.model_validate(post)
+
+
+@router.get("/{slug}/page", response_model=post_page)
+async def get_post_page(slug: str, request: Request, response: Response):
+    """Everything the post view needs in one round trip: detail, comments and vote summary."""
+    return await run_read(lambda db: cached(request, response, db, lambda: _get_post_page(db, slug), max_age=60, swr=3600))
+
+
+def _get_post_page(db: Session, slug: str) -> post_page:
+    post = _get_post(db, slug)
+    comments = comment_page(db, post.id, COMMENTS_PAGE)
+    return post_page(
+        post=post,
+        comments=comments["items"],
+        comments_next_cursor=comments["next_cursor"],
+        vote=vote_out(score=post.score, user_vote=0, truth_score=post.truth_score),
+    )
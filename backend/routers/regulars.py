@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from db import get_db
-from models import Comment, Vote, Post
+from db import run_read
+from models import Comment, Post, UserStats
+from cache import cached
 
 router = APIRouter(prefix="/api/regulars", tags=["regulars"])
 
@@ -38,47 +38,37 @@ REGULARS_FINGERPRINTS = {
 
 
 @router.get("")
-def get_regulars(db: Session = Depends(get_db)):
-    # Batch: comment counts for all regulars
-    comment_counts = dict(
-        db.query(Comment.author_name, func.count(Comment.id))
-        .filter(Comment.author_name.in_(REGULARS))
-        .group_by(Comment.author_name)
-        .all()
-    )
+async def get_regulars(request: Request, response: Response):
+    return await run_read(lambda db: cached(request, response, db, lambda: _get_regulars(db), max_age=60, swr=600))
 
-    # Batch: vote counts (upvotes) for all regulars
-    vote_counts = dict(
-        db.query(Vote.fingerprint, func.count(Vote.id))
-        .filter(Vote.fingerprint.in_(REGULARS_FINGERPRINTS.values()))
-        .group_by(Vote.fingerprint)
-        .all()
-    )
 
-    result = []
-    for name in REGULARS:
-        fp = REGULARS_FINGERPRINTS.get(name, "")
-        result.append({
-            "name": name,
-            "bio": REGULARS_BIOS.get(name, ""),
-            "comments": comment_counts.get(name, 0),
-            "votes_cast": vote_counts.get(fp, 0),
-        })
+def _regular_out(name: str, stats: UserStats | None) -> dict:
+    return {
+        "name": name,
+        "bio": REGULARS_BIOS.get(name, ""),
+        "comments": stats.comment_count if stats else 0,
+        "votes_cast": stats.votes_cast if stats else 0,
+        "last_active_at": stats.last_active_at.isoformat() if stats and stats.last_active_at else None,
+    }
+
 
+def _get_regulars(db: Session) -> list[dict]:
+    # precomputed per-author counters (see counters.py), one IN lookup on the primary key
+    stats = {s.name: s for s in db.query(UserStats).filter(UserStats.name.in_(REGULARS))}
+    result = [_regular_out(name, stats.get(name)) for name in REGULARS]
     result.sort(key=lambda x: x["comments"], reverse=True)
     return result
 
 
 @router.get("/{name}")
-def get_regular(name: str, db: Session = Depends(get_db)):
+async def get_regular(name: str, request: Request, response: Response):
     if name not in REGULARS_BIOS:
         from fastapi import HTTPException
         raise HTTPException(404, "regular not found")
+    return await run_read(lambda db: cached(request, response, db, lambda: _get_regular(db, name), max_age=60, swr=600))
 
-    comment_count = db.query(func.count(Comment.id)).filter(Comment.author_name == name).scalar()
-    fp = REGULARS_FINGERPRINTS.get(name, "")
-    vote_count = db.query(func.count(Vote.id)).filter(Vote.fingerprint == fp).scalar()
 
+def _get_regular(db: Session, name: str) -> dict:
     # Recent comments with post info
     recent_comments = (
         db.query(Comment, Post.title, Post.slug)
@@ -90,10 +80,7 @@ def get_regular(name: str, db: Session = Depends(get_db)):
     )
 
     return {
-        "name": name,
-        "bio": REGULARS_BIOS.get(name, ""),
-        "comments": comment_count,
-        "votes_cast": vote_count,
+        **_regular_out(name, db.get(UserStats, name)),
         "recent_comments": [
             {
                 "id": c.id,
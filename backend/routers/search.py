@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Query, Request, Response
+from sqlalchemy.orm import Session, selectinload
+
+from db import run_read
+from models import Post
+from schemas import post_brief, search_results
+from pagination import encode_cursor, decode_cursor
+from cache import cached
+import search
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+@router.get("", response_model=search_results)
+async def search_posts(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    cursor: str | None = Query(None, max_length=200),
+):
+    """Posts ranked by relevance of title, content and comment text to `q`."""
+    after = decode_cursor(cursor, "search", float) if cursor else None
+    return await run_read(lambda db: cached(
+        request, response, db, lambda: _search_posts(db, q, limit, after),
+        max_age=60, swr=600, q=q, limit=limit, cursor=cursor,
+    ))
+
+
+def _search_posts(db: Session, q: str, limit: int, after: tuple | None) -> search_results:
+    hits = search.search(db, q, limit + 1, after)
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+    posts = {
+        p.id: p
+        for p in db.query(Post).options(selectinload(Post.tags)).filter(Post.id.in_([h[0] for h in hits])).all()
+    } if hits else {}
+    return search_results(
+        items=[post_brief.model_validate(posts[post_id]) for post_id, _ in hits if post_id in posts],
+        next_cursor=encode_cursor("search", hits[-1][1], hits[-1][0]) if has_more else None,
+    )
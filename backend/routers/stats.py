@@ -1,21 +1,40 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from db import get_db
-from models import Post, Comment, Vote, Tag
+from db import run_read, pool_stats
+from models import SiteStats
 from schemas import stats_out
+import cache
 
 router = APIRouter(prefix="/api/stats", tags=["stats"])
 
 
 @router.get("", response_model=stats_out)
-def get_stats(db: Session = Depends(get_db)):
-    last_post = db.query(func.max(Post.created_at)).scalar()
+async def get_stats(request: Request, response: Response):
+    return await run_read(lambda db: cache.cached(request, response, db, lambda: _get_stats(db), max_age=60, swr=600))
+
+
+@router.get("/cache")
+def get_cache_stats():
+    """Response cache hit/miss counters for monitoring."""
+    return cache.stats()
+
+
+@router.get("/pool")
+def get_pool_stats():
+    """Database pool checkout counts and wait times for monitoring."""
+    return pool_stats()
+
+
+def _get_stats(db: Session) -> stats_out:
+    # one primary-key read of the snapshot maintained by counters.py
+    stats = db.get(SiteStats, 1)
+    if stats is None:
+        return stats_out(total_posts=0, total_comments=0, total_votes=0, total_tags=0)
     return stats_out(
-        total_posts=db.query(func.count(Post.id)).scalar(),
-        total_comments=db.query(func.count(Comment.id)).scalar(),
-        total_votes=db.query(func.count(Vote.id)).scalar(),
-        total_tags=db.query(func.count(Tag.id)).scalar(),
-        last_post_at=last_post,
+        total_posts=stats.total_posts,
+        total_comments=stats.total_comments,
+        total_votes=stats.total_votes,
+        total_tags=stats.total_tags,
+        last_post_at=stats.last_post_at,
     )
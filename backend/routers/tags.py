@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Request, Response
 
-from db import get_db
+from db import run_read
 from models import Tag
 from schemas import tag_out
+from cache import cached
 
 router = APIRouter(prefix="/api/tags", tags=["tags"])
 
 
 @router.get("", response_model=list[tag_out])
-def list_tags(db: Session = Depends(get_db)):
-    return db.query(Tag).order_by(Tag.name).all()
+async def list_tags(request: Request, response: Response):
+    return await run_read(lambda db: cached(
+        request, response, db, lambda: [tag_out.model_validate(t) for t in db.query(Tag).order_by(Tag.name)],
+        max_age=300, swr=86400,
+    ))
@@ -1,104 +1,153 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import datetime
 
-from db import get_db
-from models import Post, Comment, Vote
-from schemas import post_brief, user_comment_out, user_vote_out, user_profile
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, joinedload
+
+from db import run_read
+from models import Post, Comment, Vote, UserStats
+from schemas import (
+    post_brief, user_comment_out, user_vote_out, user_profile, user_posts, user_comments, user_votes,
+)
 from routers.regulars import REGULARS, REGULARS_FINGERPRINTS, REGULARS_BIOS
+from pagination import encode_cursor, decode_cursor
+from cache import cached
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
+SECTION_LIMIT = 10  # items per section on the profile itself
 
-def _calc_scores(db: Session, post_ids: list[int]) -> dict[int, int]:
-    if not post_ids:
-        return {}
-    return {
-        row[0]: row[1]
-        for row in db.query(Vote.post_id, func.coalesce(func.sum(Vote.value), 0))
-        .filter(Vote.post_id.in_(post_ids))
-        .group_by(Vote.post_id)
-        .all()
-    }
 
+@router.get("/{username}", response_model=user_profile)
+async def get_user_profile(username: str, request: Request, response: Response):
+    return await run_read(lambda db: cached(request, response, db, lambda: _get_user_profile(db, username), max_age=60, swr=600))
 
-def _calc_comment_counts(db: Session, post_ids: list[int]) -> dict[int, int]:
-    if not post_ids:
-        return {}
-    return {
-        row[0]: row[1]
-        for row in db.query(Comment.post_id, func.count(Comment.id))
-        .filter(Comment.post_id.in_(post_ids))
-        .group_by(Comment.post_id)
-        .all()
-    }
 
+@router.get("/{username}/posts", response_model=user_posts)
+async def get_user_posts(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(SECTION_LIMIT, ge=1, le=50),
+    cursor: str | None = Query(None, max_length=200),
+):
+    after = decode_cursor(cursor, "user-posts", datetime) if cursor else None
+    return await run_read(lambda db: cached(
+        request, response, db, lambda: _get_user_posts(db, username, limit, after),
+        max_age=60, swr=600, limit=limit, cursor=cursor,
+    ))
 
-@router.get("/{username}", response_model=user_profile)
-def get_user_profile(username: str, db: Session = Depends(get_db)):
-    # posts by this user
-    posts = db.query(Post).filter(Post.author_name == username).order_by(Post.created_at.desc()).all()
-    post_ids = [p.id for p in posts]
-    scores = _calc_scores(db, post_ids)
-    counts = _calc_comment_counts(db, post_ids)
-    post_briefs = []
-    for p in posts:
-        d = post_brief.model_validate(p)
-        d.score = scores.get(p.id, 0)
-        d.comment_count = counts.get(p.id, 0)
-        post_briefs.append(d)
-
-    # comments by this user — fetch parent posts in one query
-    comments = db.query(Comment).filter(Comment.author_name == username).order_by(Comment.created_at.desc()).all()
-    comment_post_ids = list({c.post_id for c in comments})
-    comment_posts = {
-        p.id: p
-        for p in db.query(Post).filter(Post.id.in_(comment_post_ids)).all()
-    } if comment_post_ids else {}
-    comment_list = []
-    for c in comments:
-        post = comment_posts.get(c.post_id)
-        if post:
-            comment_list.append(user_comment_out(
-                id=c.id,
-                post_id=c.post_id,
-                author_name=c.author_name,
-                content=c.content,
-                created_at=c.created_at,
-                post_title=post.title,
-                post_slug=post.slug,
-            ))
-
-    # votes by this user (via fingerprint mapping) — fetch posts in one query
-    vote_list = []
-    fingerprint = REGULARS_FINGERPRINTS.get(username)
-    if fingerprint:
-        votes = db.query(Vote).filter(Vote.fingerprint == fingerprint).all()
-        vote_post_ids = list({v.post_id for v in votes})
-        vote_posts = {
-            p.id: p
-            for p in db.query(Post).filter(Post.id.in_(vote_post_ids)).all()
-        } if vote_post_ids else {}
-        for v in votes:
-            post = vote_posts.get(v.post_id)
-            if post:
-                vote_list.append(user_vote_out(
-                    post_id=v.post_id,
-                    post_title=post.title,
-                    post_slug=post.slug,
-                    value=v.value,
-                ))
-
-    if not posts and not comments:
+
+@router.get("/{username}/comments", response_model=user_comments)
+async def get_user_comments(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(SECTION_LIMIT, ge=1, le=50),
+    cursor: str | None = Query(None, max_length=200),
+):
+    after = decode_cursor(cursor, "user-comments", datetime) if cursor else None
+    return await run_read(lambda db: cached(
+        request, response, db, lambda: _get_user_comments(db, username, limit, after),
+        max_age=60, swr=600, limit=limit, cursor=cursor,
+    ))
+
+
+@router.get("/{username}/votes", response_model=user_votes)
+async def get_user_votes(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(SECTION_LIMIT, ge=1, le=50),
+    cursor: str | None = Query(None, max_length=200),
+):
+    after = decode_cursor(cursor, "user-votes", int) if cursor else None
+    return await run_read(lambda db: cached(
+        request, response, db, lambda: _get_user_votes(db, username, limit, after),
+        max_age=60, swr=600, limit=limit, cursor=cursor,
+    ))
+
+
+def _get_user_profile(db: Session, username: str) -> user_profile:
+    # totals are maintained by counters.py, so a missing row means no activity at all
+    stats = db.get(UserStats, username)
+    if stats is None or not (stats.post_count or stats.comment_count):
         raise HTTPException(404, "user not found")
 
     return user_profile(
         username=username,
         is_regular=username in REGULARS,
         bio=REGULARS_BIOS.get(username),
-        posts=post_briefs,
-        comments=comment_list,
-        votes=vote_list,
-        post_count=len(post_briefs),
-        comment_count=len(comment_list),
+        posts=_get_user_posts(db, username, SECTION_LIMIT),
+        comments=_get_user_comments(db, username, SECTION_LIMIT),
+        votes=_get_user_votes(db, username, SECTION_LIMIT),
+        post_count=stats.post_count,
+        comment_count=stats.comment_count,
+        vote_count=stats.votes_cast,
+    )
+
+
+def _get_user_posts(db: Session, username: str, limit: int, after: tuple | None = None) -> user_posts:
+    # joinedload keeps tags in the same statement (the LIMIT goes into a subquery)
+    q = (
+        db.query(Post)
+        .options(joinedload(Post.tags))
+        .filter(Post.author_name == username)
+        .order_by(Post.created_at.desc(), Post.id.desc())
+    )
+    if after:
+        q = q.filter(tuple_(Post.created_at, Post.id) < after)
+    posts = q.limit(limit + 1).all()
+    has_more = len(posts) > limit
+    posts = posts[:limit]
+    return user_posts(
+        items=[post_brief.model_validate(p) for p in posts],
+        next_cursor=encode_cursor("user-posts", posts[-1].created_at, posts[-1].id) if has_more else None,
+    )
+
+
+def _get_user_comments(db: Session, username: str, limit: int, after: tuple | None = None) -> user_comments:
+    # one joined select, only the columns the response needs
+    q = (
+        db.query(
+            Comment.id, Comment.post_id, Comment.author_name, Comment.content, Comment.created_at,
+            Post.title.label("post_title"), Post.slug.label("post_slug"),
+        )
+        .join(Post, Comment.post_id == Post.id)
+        .filter(Comment.author_name == username)
+        .order_by(Comment.created_at.desc(), Comment.id.desc())
+    )
+    if after:
+        q = q.filter(tuple_(Comment.created_at, Comment.id) < after)
+    rows = q.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return user_comments(
+        items=[user_comment_out(**row._mapping) for row in rows],
+        next_cursor=encode_cursor("user-comments", rows[-1].created_at, rows[-1].id) if has_more else None,
+    )
+
+
+def _get_user_votes(db: Session, username: str, limit: int, after: tuple | None = None) -> user_votes:
+    # votes are only tied to a name for the regulars (via fingerprint mapping)
+    fingerprint = REGULARS_FINGERPRINTS.get(username)
+    if not fingerprint:
+        return user_votes(items=[])
+    q = (
+        db.query(Vote.id, Vote.post_id, Vote.value, Post.title.label("post_title"), Post.slug.label("post_slug"))
+        .join(Post, Vote.post_id == Post.id)
+        .filter(Vote.fingerprint == fingerprint)
+        .order_by(Vote.id.desc())
+    )
+    if after:
+        q = q.filter(Vote.id < after[1])
+    rows = q.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return user_votes(
+        items=[
+            user_vote_out(post_id=row.post_id, post_title=row.post_title, post_slug=row.post_slug, value=row.value)
+            for row in rows
+        ],
+        next_cursor=encode_cursor("user-votes", rows[-1].id, rows[-1].id) if has_more else None,
     )
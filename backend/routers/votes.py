@@ -1,19 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from db import get_db
-from models import Post, Vote
+from db import run_read
+from models import Post
 from schemas import vote_out
+from cache import cached
 
 router = APIRouter(prefix="/api/posts", tags=["votes"])
 
 
 @router.get("/{post_id}/vote", response_model=vote_out)
-def get_vote(post_id: int, fingerprint: str = Query("", max_length=64), db: Session = Depends(get_db)):
+async def get_vote(
+    post_id: int,
+    request: Request,
+    response: Response,
+    fingerprint: str = Query("", max_length=64),
+):
+    # fingerprint is accepted for compatibility but doesn't change the response
+    # (user_vote is always 0), so it stays out of the cache key
+    return await run_read(lambda db: cached(
+        request, response, db, lambda: _get_vote(db, post_id), max_age=60, swr=3600,
+    ))
+
+
+def _get_vote(db: Session, post_id: int) -> vote_out:
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
         raise HTTPException(404, "post not found")
-
-    score = db.query(func.coalesce(func.sum(Vote.value), 0)).filter(Vote.post_id == post_id).scalar()
-    return vote_out(score=score, user_vote=0, truth_score=post.truth_score)
+    return vote_out(score=post.score, user_vote=0, truth_score=post.truth_score)
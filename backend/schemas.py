@@ -36,11 +36,23 @@ class post_detail(post_brief):
     content: str
 
 
+class search_results(BaseModel):
+    items: list[post_brief]
+    next_cursor: str | None = None
+
+
+class posts_batch(BaseModel):
+    items: list[post_detail]
+    missing: list[str]
+
+
 class paginated_posts(BaseModel):
     items: list[post_brief]
-    total: int
-    page: int
-    pages: int
+    # total/page/pages are only filled in page mode; cursor mode skips the COUNT
+    total: int | None = None
+    page: int | None = None
+    pages: int | None = None
+    next_cursor: str | None = None
 
 
 # --- comments ---
@@ -62,6 +74,28 @@ class vote_out(BaseModel):
     truth_score: int
 
 
+class vote_summary(BaseModel):
+    post_id: int
+    score: int
+    comment_count: int
+    truth_score: int
+
+
+class votes_batch(BaseModel):
+    items: list[vote_summary]
+    missing: list[int]
+
+
+# --- post page (detail + comments + votes in one response) ---
+
+class post_page(BaseModel):
+    post: post_detail
+    # first page of comments; post.comment_count is the total
+    comments: list[comment_out]
+    comments_next_cursor: str | None = None
+    vote: vote_out
+
+
 # --- user profile ---
 
 class user_comment_out(comment_out):
@@ -76,15 +110,32 @@ class user_vote_out(BaseModel):
     value: int
 
 
+class user_posts(BaseModel):
+    items: list[post_brief]
+    next_cursor: str | None = None
+
+
+class user_comments(BaseModel):
+    items: list[user_comment_out]
+    next_cursor: str | None = None
+
+
+class user_votes(BaseModel):
+    items: list[user_vote_out]
+    next_cursor: str | None = None
+
+
 class user_profile(BaseModel):
     username: str
     is_regular: bool
     bio: str | None = None
-    posts: list[post_brief]
-    comments: list[user_comment_out]
-    votes: list[user_vote_out]
+    # first page of each section; the rest via /api/users/{username}/{section}?cursor=
+    posts: user_posts
+    comments: user_comments
+    votes: user_votes
     post_count: int
     comment_count: int
+    vote_count: int = 0
 
 
 # --- stats ---
@@ -0,0 +1,122 @@
+"""
+Full-text search over posts: title, content and the text of their comments.
+SQLite keeps an FTS5 table (post_search, rowid = post id); Postgres keeps a
+weighted tsvector column on posts with a GIN index. Which one is used follows
+db.py's backend choice. Write paths call index_post() for every post they add
+or comment on, so the index is always current.
+Run this file directly to rebuild the whole index.
+"""
+import re
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from db import is_postgres
+
+_IDS = bindparam("ids", expanding=True)
+
+# title matches outrank body matches, which outrank comment matches
+_PG_DOCUMENT = """
+    setweight(to_tsvector('english', posts.title), 'A')
+    || setweight(to_tsvector('english', posts.content), 'B')
+    || setweight(to_tsvector('english', coalesce(
+        (SELECT string_agg(c.content, ' ') FROM comments c WHERE c.post_id = posts.id), ''
+    )), 'C')
+"""
+_SQLITE_SELECT = """
+    SELECT posts.id, posts.title, posts.content,
+           coalesce((SELECT group_concat(c.content, ' ') FROM comments c WHERE c.post_id = posts.id), '')
+    FROM posts
+"""
+
+
+def create_index(conn):
+    """Create the backend's search structure (idempotent)."""
+    if is_postgres:
+        conn.execute(text("ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_posts_search ON posts USING GIN (search_vector)"))
+    else:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS post_search "
+            "USING fts5(title, content, comments, tokenize='unicode61 remove_diacritics 2')"
+        ))
+
+
+def index_post(db: Session, post_id: int):
+    """Re-index one post after it, or one of its comments, was written."""
+    index_posts(db, [post_id])
+
+
+def index_posts(db: Session, post_ids):
+    """Re-index several posts in one statement per backend step (bulk writes)."""
+    db.flush()
+    params = {"ids": list(post_ids)}
+    if not params["ids"]:
+        return
+    if is_postgres:
+        db.execute(
+            text(f"UPDATE posts SET search_vector = {_PG_DOCUMENT} WHERE posts.id IN :ids").bindparams(_IDS),
+            params,
+        )
+    else:
+        db.execute(text("DELETE FROM post_search WHERE rowid IN :ids").bindparams(_IDS), params)
+        db.execute(
+            text(f"INSERT INTO post_search (rowid, title, content, comments) {_SQLITE_SELECT} WHERE posts.id IN :ids")
+            .bindparams(_IDS),
+            params,
+        )
+
+
+def rebuild(db: Session):
+    """Re-index every post (bulk writes, migrations, repair)."""
+    db.flush()
+    if is_postgres:
+        db.execute(text(f"UPDATE posts SET search_vector = {_PG_DOCUMENT}"))
+    else:
+        db.execute(text("DELETE FROM post_search"))
+        db.execute(text(f"INSERT INTO post_search (rowid, title, content, comments) {_SQLITE_SELECT}"))
+
+
+def search(db: Session, q: str, limit: int, after: tuple[float, int] | None = None) -> list[tuple[int, float]]:
+    """
+    Return up to `limit` (post_id, rank) pairs, best first. `after` is the
+    (rank, post_id) of the last row of the previous page.
+    """
+    if is_postgres:
+        ranked = """
+            SELECT posts.id AS post_id, ts_rank(posts.search_vector, query) AS rank
+            FROM posts, websearch_to_tsquery('english', :q) AS query
+            WHERE posts.search_vector @@ query
+        """
+        params = {"q": q}
+    else:
+        # FTS5 query syntax is strict, so match on quoted words only (implicit AND)
+        words = re.findall(r"\w+", q)
+        if not words:
+            return []
+        ranked = """
+            SELECT rowid AS post_id, -bm25(post_search, 10.0, 4.0, 1.0) AS rank
+            FROM post_search
+            WHERE post_search MATCH :q
+        """
+        params = {"q": " ".join(f'"{w}"' for w in words)}
+
+    sql = f"SELECT post_id, rank FROM ({ranked}) AS ranked"
+    if after:
+        sql += " WHERE rank < :rank OR (rank = :rank AND post_id < :after_id)"
+        params.update(rank=after[0], after_id=after[1])
+    sql += " ORDER BY rank DESC, post_id DESC LIMIT :limit"
+    params["limit"] = limit
+    return [(row.post_id, row.rank) for row in db.execute(text(sql), params)]
+
+
+if __name__ == "__main__":
+    from db import session_local
+
+    db = session_local()
+    try:
+        rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+    print("search index rebuilt")
@@ -1,5 +1,9 @@
 from sqlalchemy.orm import Session
 from models import Post, Tag, Comment, Vote
+import counters
+import cache
+import search
+from migrations import SEED_VERSION
 from slugify import slugify
 from datetime import datetime, timezone, timedelta
 
@@ -11,16 +15,28 @@ def _patch_dates(db: Session):
         slugify("Kamuto Hirovato — Xavi plans to replace ter Stegen with a GK who also plays libero")[:80]: datetime(2026, 1, 23, 15, 0, tzinfo=timezone.utc),
         slugify("PSG president Al-Khelaifi attacked match official after Real Madrid loss, broke his chain")[:80]: datetime(2026, 1, 20, 22, 0, tzinfo=timezone.utc),
     }
+    patched = False
     for slug, new_date in fixes.items():
         post = db.query(Post).filter(Post.slug == slug).first()
         if post and post.created_at and post.created_at.year == 2022:
             post.created_at = new_date
+            patched = True
+    if patched:
+        # created_at is mirrored into post_ranks, site_stats and user_stats, and drives hot_score
+        db.flush()
+        counters.refresh_hot_scores(db)
+        counters.rebuild_post_ranks(db)
+        counters.rebuild_site_stats(db)
+        counters.rebuild_user_stats(db)
+        cache.bump_data_version(db)
     db.commit()
 
 
 def run(db: Session):
     _patch_dates(db)
     if db.query(Post).first():
+        cache.set_meta(db, "seed_version", SEED_VERSION)
+        db.commit()
         return  # already seeded
 
     # tags
@@ -35,6 +51,7 @@ def run(db: Session):
     ]:
         t = Tag(name=name, slug=slugify(name), color=color)
         db.add(t)
+        counters.record_tag(db)
         tags[name] = t
 
     db.flush()
@@ -422,6 +439,7 @@ def run(db: Session):
         )
         for tag_name in pd["tags"]:
             p.tags.append(tags[tag_name])
+        counters.record_post(db, p)
         db.add(p)
         posts.append(p)
 
@@ -724,6 +742,7 @@ def run(db: Session):
             created_at=now - timedelta(minutes=30 * (len(comments_data) - comments_data.index((post_idx, author, content)))),
         )
         db.add(c)
+        counters.record_comment(db, posts[post_idx], c)
 
     # votes from regulars
     # upvote = "I believe this", downvote = "this is fake"
@@ -748,6 +767,7 @@ def run(db: Session):
         for post_idx, val in votes:
             v = Vote(post_id=posts[post_idx].id, fingerprint=fp, value=val)
             db.add(v)
+            counters.record_vote(db, posts[post_idx], v)
             vote_totals[post_idx] = vote_totals.get(post_idx, 0) + val
 
     # adjust truth_score based on votes: each net vote = +/- 20
@@ -755,5 +775,9 @@ def run(db: Session):
         p = posts[post_idx]
         p.truth_score = max(0, min(100, p.truth_score + net * 20))
 
+    search.rebuild(db)
+    counters.refresh_hot_scores(db)
+    cache.bump_data_version(db)
+    cache.set_meta(db, "seed_version", SEED_VERSION)
     db.commit()
     print("db seeded")
@@ -0,0 +1,94 @@
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# db.py reads these at import: a throwaway SQLite file, never a configured Postgres
+_tmp = tempfile.mkdtemp(prefix="fakefootball-tests-")
+atexit.register(shutil.rmtree, _tmp, ignore_errors=True)
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "test.db")
+os.environ["SQLITE_SNAPSHOT"] = "0"
+for _var in ("DATABASE_URL", "POSTGRES_URL", "DATABASE_READ_URL", "DB_ASYNC"):
+    os.environ.pop(_var, None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+
+# author of the bulk posts below; a regular, so the profile has all three sections
+AUTHOR = "kris"
+BULK_POSTS = 60
+
+
+def _bulk_lines():
+    for i in range(BULK_POSTS):
+        slug = f"test-post-{i}"
+        yield json.dumps({
+            "type": "post", "slug": slug, "title": f"test post {i}", "content": "lorem ipsum",
+            "author_name": AUTHOR, "created_at": f"2026-03-{1 + i % 28:02d}T{i % 24:02d}:{i:02d}:00",
+            "tags": ["transfer", "stats"],
+        })
+        for j in range(2):
+            yield json.dumps({
+                "type": "comment", "post_slug": slug, "author_name": AUTHOR if j else "someone",
+                "content": "comment", "created_at": f"2026-04-{1 + i % 28:02d}T{j:02d}:{i:02d}:00",
+            })
+        yield json.dumps({"type": "vote", "post_slug": slug, "fingerprint": AUTHOR, "value": 1})
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """The seeded test database plus BULK_POSTS posts by AUTHOR with comments and votes."""
+    from db import engine, session_local
+    from models import Base
+    from importer import import_lines
+    import migrations
+    import seed
+
+    Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
+    db = session_local()
+    try:
+        seed.run(db)
+        import_lines(db, _bulk_lines())
+    finally:
+        db.close()
+    return engine
+
+
+@pytest.fixture
+def author():
+    return AUTHOR
+
+
+@pytest.fixture
+def db(engine):
+    from db import session_local
+
+    session = session_local()
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    """Context manager collecting (sql, params) for every statement run inside it."""
+    @contextmanager
+    def capture():
+        seen = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            seen.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield seen
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return capture
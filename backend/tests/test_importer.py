@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+import counters
+import search
+from importer import import_lines
+from models import Post, PostRank, SiteStats, UserStats
+
+
+def _derived(db) -> dict:
+    """Everything import_lines maintains incrementally, in comparable form."""
+    stats = db.get(SiteStats, 1)
+    db.refresh(stats)
+    return {
+        "posts": sorted(db.query(Post.id, Post.score, Post.comment_count)),
+        "hot": dict(db.query(Post.id, Post.hot_score)),
+        "ranks": sorted(db.query(PostRank.tag_id, PostRank.post_id, PostRank.created_at, PostRank.score, PostRank.comment_count)),
+        "site": (stats.total_posts, stats.total_comments, stats.total_votes, stats.total_tags, stats.last_post_at),
+        "users": sorted(db.query(UserStats.name, UserStats.post_count, UserStats.comment_count, UserStats.votes_cast, UserStats.last_active_at)),
+        "search": sorted(db.execute(text("SELECT rowid, title, content, comments FROM post_search"))),
+    }
+
+
+def _archive():
+    yield {"type": "tag", "name": "Imported", "slug": "imported", "color": "#123456"}
+    for i in range(5):
+        yield {
+            "type": "post", "slug": f"imported-{i}", "title": f"imported quokka {i}", "content": "body",
+            "author_name": "importer", "created_at": f"2030-01-0{i + 1}T12:00:00", "tags": ["imported", "transfer"],
+        }
+        yield {"type": "comment", "post_slug": f"imported-{i}", "author_name": "leo", "content": "quokka comment",
+               "created_at": f"2030-01-0{i + 1}T13:00:00"}
+        yield {"type": "vote", "post_slug": f"imported-{i}", "fingerprint": "leo", "value": -1}
+    # activity on posts that were already there
+    yield {"type": "comment", "post_slug": "test-post-1", "author_name": "importer", "content": "late reply",
+           "created_at": "2026-05-01T00:00:00"}
+    yield {"type": "vote", "post_slug": "test-post-1", "fingerprint": "shiki", "value": 1}
+
+
+def test_import_matches_full_rebuild(db):
+    lines = [json.dumps(line) for line in _archive()]
+    result = import_lines(db, lines)
+    assert result["inserted"] == {"tag": 1, "post": 5, "comment": 6, "vote": 6}
+
+    incremental = _derived(db)
+    counters.recalc_post_counters(db)
+    counters.refresh_hot_scores(db)
+    counters.rebuild_post_ranks(db)
+    counters.rebuild_site_stats(db)
+    counters.rebuild_user_stats(db)
+    search.rebuild(db)
+    db.flush()
+    rebuilt = _derived(db)
+    db.rollback()
+
+    # hot scores decay by the second, so compare those approximately
+    assert incremental.pop("hot") == pytest.approx(rebuilt.pop("hot"), rel=1e-3)
+    assert incremental == rebuilt
+
+    again = import_lines(db, lines)
+    assert again["inserted"] == {"tag": 0, "post": 0, "comment": 0, "vote": 0}
+    assert again["derived_seconds"] == 0
@@ -0,0 +1,72 @@
+"""
+Fixed SQL statement counts per endpoint, whatever the page size: tags are
+batch-loaded for the whole page, never lazily per post.
+"""
+from datetime import datetime
+
+import pytest
+
+from pagination import decode_cursor
+from routers import posts, users
+
+
+@pytest.mark.parametrize("per_page", [2, 50])
+@pytest.mark.parametrize("sort", ["new", "top", "discussed", "hot"])
+@pytest.mark.parametrize("tag", [None, "transfer"])
+def test_list_posts(db, statements, per_page, sort, tag):
+    with statements() as seen:
+        page = posts._list_posts(db, sort, tag, 1, per_page, None)
+    assert len(page.items) == per_page
+    assert all(item.tags for item in page.items)
+    # COUNT, the page, its tags
+    assert len(seen) == 3
+
+    with statements() as seen:
+        page = posts._list_posts(db, sort, tag, 1, per_page, page.next_cursor)
+    assert page.items
+    # keyset pages skip the COUNT
+    assert len(seen) == 2
+
+
+def test_post_detail(db, statements):
+    with statements() as seen:
+        post = posts._get_post(db, "test-post-7")
+    assert post.tags
+    assert len(seen) == 2
+
+
+@pytest.mark.parametrize("limit", [2, 50])
+def test_user_profile(db, statements, author, monkeypatch, limit):
+    monkeypatch.setattr(users, "SECTION_LIMIT", limit)
+    with statements() as seen:
+        profile = users._get_user_profile(db, author)
+    assert len(profile.posts.items) == limit
+    assert all(item.tags for item in profile.posts.items)
+    assert len(profile.comments.items) == limit
+    assert len(profile.votes.items) == limit
+    # user_stats row, then one statement per section
+    assert len(seen) == 4
+
+
+def test_non_regular_profile(db, statements):
+    with statements() as seen:
+        profile = users._get_user_profile(db, "someone")
+    assert profile.comments.items and not profile.votes.items
+    # no fingerprint, so no votes query
+    assert len(seen) == 3
+
+
+@pytest.mark.parametrize("limit", [2, 50])
+@pytest.mark.parametrize("section", ["posts", "comments", "votes"])
+def test_user_section_pages(db, statements, author, section, limit):
+    build = getattr(users, f"_get_user_{section}")
+    with statements() as seen:
+        page = build(db, author, limit)
+    assert len(page.items) == limit and page.next_cursor
+    # joined, column-only select: post titles and slugs come in the same statement
+    assert len(seen) == 1
+
+    after = decode_cursor(page.next_cursor, f"user-{section}", int if section == "votes" else datetime)
+    with statements() as seen:
+        build(db, author, limit, after)
+    assert len(seen) == 1
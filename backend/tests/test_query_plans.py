@@ -0,0 +1,71 @@
+"""
+Each router query shape is answered from its index (migrations 2, 3 and 5),
+checked with EXPLAIN QUERY PLAN on the statements the routers actually run.
+"""
+import pytest
+
+from models import Post
+from routers import posts, users
+from routers.comments import comment_page
+
+
+def _plans(db, seen, table: str) -> list[str]:
+    """Query plans, one string each, of the captured statements that read `table`."""
+    plans = []
+    for statement, params in seen:
+        if f"FROM {table}" in statement or f"JOIN {table}" in statement:
+            rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).all()
+            plans.append(" | ".join(row[-1] for row in rows))
+    assert plans, f"no statement read {table}"
+    return plans
+
+
+@pytest.mark.parametrize("sort, index", [
+    ("new", "ix_post_ranks_created"),
+    ("top", "ix_post_ranks_score"),
+    ("discussed", "ix_post_ranks_comment_count"),
+    ("hot", "ix_post_ranks_hot"),
+])
+def test_tag_listing_walks_post_ranks_index(db, statements, sort, index):
+    page = posts._list_posts(db, sort, "transfer", 1, 5, None)
+    with statements() as seen:
+        posts._list_posts(db, sort, "transfer", 1, 5, page.next_cursor)
+    assert all(index in plan for plan in _plans(db, seen, "post_ranks"))
+
+
+@pytest.mark.parametrize("sort, index", [
+    ("new", "ix_posts_created"),
+    ("top", "ix_posts_score"),
+    ("discussed", "ix_posts_comment_count"),
+    ("hot", "ix_posts_hot"),
+])
+def test_listing_walks_posts_index(db, statements, sort, index):
+    page = posts._list_posts(db, sort, None, 1, 5, None)
+    with statements() as seen:
+        posts._list_posts(db, sort, None, 1, 5, page.next_cursor)
+    assert index in _plans(db, seen, "posts")[0]
+
+
+def test_post_comments_use_post_created_index(db, statements):
+    post_id = posts._get_post(db, "test-post-3").id
+    with statements() as seen:
+        comment_page(db, post_id, 50)
+    assert "ix_comments_post_created" in _plans(db, seen, "comments")[0]
+
+
+@pytest.mark.parametrize("section, table, index", [
+    ("posts", "posts", "ix_posts_author_created"),
+    ("comments", "comments", "ix_comments_author_created"),
+    ("votes", "votes", "ix_votes_fingerprint"),
+])
+def test_user_sections_use_author_index(db, statements, author, section, table, index):
+    with statements() as seen:
+        getattr(users, f"_get_user_{section}")(db, author, 10)
+    assert index in _plans(db, seen, table)[0]
+
+
+def test_post_ranks_by_post_use_index(db, statements):
+    post = db.query(Post).filter(Post.slug == "test-post-5").one()
+    with statements() as seen:
+        assert post.ranks
+    assert "ix_post_ranks_post" in _plans(db, seen, "post_ranks")[0]
@@ -0,0 +1,6 @@
+import profile_startup
+
+
+def test_read_path_startup_within_budget():
+    # fresh interpreters, so this measures a cold start, not this test process
+    assert profile_startup.check() == []
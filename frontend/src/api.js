@@ -13,8 +13,24 @@ export default {
     return http.get(`/posts/${slug}`).then(r => r.data)
   },
 
-  getComments(postId) {
-    return http.get(`/posts/${postId}/comments`).then(r => r.data)
+  getPostPage(slug) {
+    return http.get(`/posts/${slug}/page`).then(r => r.data)
+  },
+
+  getPostsBatch(slugs) {
+    return http.get('/batch/posts', { params: { slugs: slugs.join(',') } }).then(r => r.data)
+  },
+
+  getVotesBatch(ids) {
+    return http.get('/batch/votes', { params: { ids: ids.join(',') } }).then(r => r.data)
+  },
+
+  getComments(postId, after = null) {
+    return http.get(`/posts/${postId}/comments`, { params: { after } }).then(r => ({
+      items: r.data,
+      total: Number(r.headers['x-total-count']),
+      nextCursor: r.headers['x-next-cursor'] || null,
+    }))
   },
 
   getTags() {
@@ -36,4 +52,8 @@ export default {
   getUserProfile(username) {
     return http.get(`/users/${encodeURIComponent(username)}`).then(r => r.data)
   },
+
+  getUserSection(username, section, cursor) {
+    return http.get(`/users/${encodeURIComponent(username)}/${section}`, { params: { cursor } }).then(r => r.data)
+  },
 }
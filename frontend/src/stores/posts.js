@@ -5,7 +5,9 @@ import api from '../api.js'
 export const usePostsStore = defineStore('posts', () => {
   const posts = ref([])
   const currentPost = ref(null)
-  const sort = ref('new')
+  const currentComments = ref([])
+  const commentsCursor = ref(null)
+  const sort = ref('hot')
   const activeTag = ref(null)
   const loading = ref(false)
   const page = ref(1)
@@ -25,12 +27,21 @@ export const usePostsStore = defineStore('posts', () => {
   async function fetchPost(slug) {
     loading.value = true
     try {
-      currentPost.value = await api.getPost(slug)
+      const data = await api.getPostPage(slug)
+      currentPost.value = data.post
+      currentComments.value = data.comments
+      commentsCursor.value = data.comments_next_cursor
     } finally {
       loading.value = false
     }
   }
 
+  async function loadMoreComments() {
+    const data = await api.getComments(currentPost.value.id, commentsCursor.value)
+    currentComments.value.push(...data.items)
+    commentsCursor.value = data.nextCursor
+  }
+
   function setSort(s) {
     sort.value = s
     page.value = 1
@@ -48,5 +59,8 @@ export const usePostsStore = defineStore('posts', () => {
     fetchPosts()
   }
 
-  return { posts, currentPost, sort, activeTag, loading, page, totalPages, fetchPosts, fetchPost, setSort, setTag, setPage }
+  return {
+    posts, currentPost, currentComments, commentsCursor, sort, activeTag, loading, page, totalPages,
+    fetchPosts, fetchPost, loadMoreComments, setSort, setTag, setPage,
+  }
 })